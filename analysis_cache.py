@@ -0,0 +1,227 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS
+from near_duplicates import NearDuplicateClusters
+from risk_scoring import score_batch
+from rule_engine import get_ruleset
+from term_index import TermIndex
+
+# Upper edge is 101 so that capped scores of 100 still land in "High"
+RISK_BINS = [0, 30, 70, 101]
+RISK_LABELS = ["Low", "Medium", "High"]
+
+RED_FLAG_TERMS = [
+    "payment", "deposit", "fee", "unpaid", "money",
+    "investment", "registration", "training", "guaranteed",
+    "required", "pay", "send", "secure", "opportunity"
+]
+
+
+def fingerprint_bytes(chunks):
+    """
+    Hashes raw upload contents.
+
+    Args:
+        chunks (iterable): Bytes objects, e.g. the contents of each uploaded file.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(hashlib.sha256(chunk).digest())
+    return digest.hexdigest()
+
+
+def fingerprint_frame(df):
+    """
+    Hashes a DataFrame's contents, for frames that did not come from a file.
+
+    Args:
+        df (pd.DataFrame): The data.
+
+    Returns:
+        str: Hex SHA-256 digest over column names and row hashes.
+    """
+    digest = hashlib.sha256(repr(list(df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df.astype(str), index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class AnalysisResult:
+    """
+    Everything the dashboard derives from one dataset, computed once.
+
+    Treat instances as read-only: they are shared between reruns and sessions.
+
+    Attributes:
+        scores (pd.Series): Risk Score per row.
+        levels (pd.Series): Risk Level per row.
+        order (np.ndarray): Row positions sorted by descending Risk Score.
+        company_stats (pd.DataFrame or None): Per-company aggregates.
+        risk_dist (pd.DataFrame): Listings per Risk Level.
+        term_index (TermIndex): Word -> rows index of the description column.
+        term_counts (pd.DataFrame): Listings containing each red flag term.
+        clusters (NearDuplicateClusters or None): Near-duplicate groups, when deduplicated.
+        cluster_stats (pd.DataFrame or None): Clusters of two or more listings, largest first.
+    """
+
+    def __init__(self, scores, levels, order, company_stats, risk_dist, term_index, term_counts,
+                 clusters=None, cluster_stats=None):
+        self.scores = scores
+        self.levels = levels
+        self.order = order
+        self.company_stats = company_stats
+        self.risk_dist = risk_dist
+        self.term_index = term_index
+        self.term_counts = term_counts
+        self.clusters = clusters
+        self.cluster_stats = cluster_stats
+
+
+def _company_stats(df, scores, levels, clusters=None):
+    """Per-company aggregates, with cluster counts when near-duplicates were grouped."""
+    if "Companies" not in df.columns:
+        return None
+    frame = pd.DataFrame({"Companies": df["Companies"], "Risk Score": scores, "High": levels == "High"})
+    aggregations = dict(
+        Avg_Risk=("Risk Score", "mean"),
+        Count=("Risk Score", "count"),
+        High_Risk=("High", "sum")
+    )
+    if clusters is not None:
+        frame["Cluster"] = clusters.labels
+        frame["Cluster Size"] = clusters.sizes
+        aggregations.update(Clusters=("Cluster", "nunique"), Largest_Cluster=("Cluster Size", "max"))
+    return frame.groupby("Companies", observed=True).agg(**aggregations).sort_values("Avg_Risk", ascending=False)
+
+
+def add_clusters(result, df, clusters):
+    """
+    Adds near-duplicate groups to an analysis.
+
+    Scores are left as they are: every listing keeps its own rule score, and
+    the groups are only used to send one listing per group to GenAI and to
+    report reposts.
+
+    Args:
+        result (AnalysisResult): Analysis of `df` without clusters.
+        df (pd.DataFrame): Listings.
+        clusters (NearDuplicateClusters): Groups of the description column.
+
+    Returns:
+        AnalysisResult: A new result sharing the scores and index of `result`.
+    """
+    return AnalysisResult(
+        result.scores, result.levels, result.order, _company_stats(df, result.scores, result.levels, clusters),
+        result.risk_dist, result.term_index, result.term_counts, clusters, clusters.summary(df, result.scores),
+    )
+
+
+def analyze_dataset(df, description_column, ruleset=None, dedupe=False, profile=False):
+    """
+    Scores a dataset and computes the aggregates shown in the dashboard.
+
+    Args:
+        df (pd.DataFrame): Listings.
+        description_column (str): Column with the job descriptions.
+        ruleset (RuleSet, optional): Rules to score with; defaults to the current file.
+        dedupe (bool): Also group near-duplicate descriptions (see `add_clusters`).
+        profile (bool): Record per-rule timing while scoring (see `score_batch`).
+
+    Returns:
+        AnalysisResult: Scores, levels, sort order and aggregates.
+    """
+    if ruleset is None:
+        ruleset = get_ruleset()
+    texts = df[description_column]
+    # Streaming uploads are scored while loading; reuse those scores when they still apply
+    if ("Risk Score" in df.columns and df.attrs.get("scored_column") == description_column
+            and df.attrs.get("ruleset_digest") == ruleset.digest):
+        scores = df["Risk Score"].rename("Risk Score")
+    else:
+        scores, _ = score_batch(texts, ruleset, profile)
+    levels = pd.cut(scores, bins=RISK_BINS, labels=RISK_LABELS, right=False).rename("Risk Level")
+    order = np.argsort(-scores.to_numpy(), kind="stable")
+
+    risk_dist = levels.value_counts().reset_index()
+    risk_dist.columns = ["Risk Level", "count"]
+
+    term_index = TermIndex.build(texts)
+    result = AnalysisResult(scores, levels, order, _company_stats(df, scores, levels), risk_dist,
+                            term_index, term_index.counts(RED_FLAG_TERMS))
+    if dedupe:
+        with METRICS.stage("near_duplicates", rows=len(texts)):
+            clusters = NearDuplicateClusters.build(texts)
+        result = add_clusters(result, df, clusters)
+    return result
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU of AnalysisResults keyed by dataset fingerprint.
+
+    Each entry holds the analysis and, once asked for, the same analysis with
+    near-duplicate groups, so toggling grouping never rescores the dataset.
+
+    Args:
+        max_entries (int): Datasets kept before the least recently used is evicted.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, fingerprint, description_column, ruleset, dedupe=False, profile=False):
+        """
+        Returns the analysis for a dataset, computing it on first use.
+
+        Args:
+            df (pd.DataFrame): Listings.
+            fingerprint (str): Hash of the source data (see `fingerprint_bytes`).
+            description_column (str): Column with the job descriptions.
+            ruleset (RuleSet): Rules to score with; its content digest is part of the key.
+            dedupe (bool): Include near-duplicate groups (see `add_clusters`).
+            profile (bool): Record per-rule timing if the dataset has to be scored.
+
+        Returns:
+            AnalysisResult: The cached or freshly computed analysis.
+        """
+        key = (fingerprint, ruleset.digest, description_column)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            METRICS.incr("analysis_cache_hits")
+        else:
+            with self._lock:
+                self.misses += 1
+            METRICS.incr("analysis_cache_misses")
+            with METRICS.stage("analysis", rows=len(df)):
+                entry = {"plain": analyze_dataset(df, description_column, ruleset, profile=profile)}
+            self._store(key, entry)
+        if not dedupe:
+            return entry["plain"]
+        if "deduped" not in entry:
+            texts = df[description_column]
+            with METRICS.stage("near_duplicates", rows=len(texts)):
+                clusters = NearDuplicateClusters.build(texts)
+            entry["deduped"] = add_clusters(entry["plain"], df, clusters)
+        return entry["deduped"]
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
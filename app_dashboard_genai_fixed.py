@@ -1,45 +1,65 @@
-from genai_analysis import analyze_with_genai
+from analysis_cache import AnalysisCache, fingerprint_bytes, fingerprint_frame
+from chart_data import (HISTOGRAM_BINS, MAX_TOP_N, PAGE_SIZES, TOP_N, page_slice, position_summary,
+                        score_histogram, top_listings)
+from genai_cache import GenAICache
+from ingestion import NEEDED_COLUMNS, load_streaming
+from instrumentation import METRICS
+from listing_store import ListingStore
+from pdf_ingestion import PdfTextCache, load_pdfs
+from rule_engine import get_ruleset
+from triage import DEFAULT_BAND, triage_analyze
+from wordcloud_render import frequencies_from_index, render_wordcloud_png
 import streamlit as st
 import os
+import time
 import pandas as pd
 import plotly.express as px
-import re
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from PyPDF2 import PdfReader
 openai_api_key = os.getenv("OPENAI_API_KEY")
 st.set_page_config(page_title="Scamternship Detector Dashboard", layout="wide")
 
+# GenAI batch limits; match these to your OpenAI account's rate limits
+GENAI_CONCURRENCY = int(os.getenv("GENAI_CONCURRENCY", "8"))
+GENAI_REQUESTS_PER_MINUTE = float(os.getenv("GENAI_REQUESTS_PER_MINUTE", "3500"))
+GENAI_TOKENS_PER_MINUTE = float(os.getenv("GENAI_TOKENS_PER_MINUTE", "90000"))
+# Uploads larger than this default to chunked, column-pruned loading
+STREAMING_THRESHOLD_BYTES = int(os.getenv("STREAMING_THRESHOLD_BYTES", str(100 * 1024 * 1024)))
+GENAI_CACHE_MAX_ENTRIES = int(os.getenv("GENAI_CACHE_MAX_ENTRIES", "100000"))
+GENAI_CACHE_TTL = float(os.getenv("GENAI_CACHE_TTL", "0")) or None
+# Number of analyzed datasets kept in memory across reruns and sessions
+ANALYSIS_CACHE_ENTRIES = int(os.getenv("ANALYSIS_CACHE_ENTRIES", "8"))
+
+@st.cache_resource
+def get_genai_cache():
+    # One cache connection shared by every session and rerun
+    return GenAICache(max_entries=GENAI_CACHE_MAX_ENTRIES, ttl=GENAI_CACHE_TTL)
+
+@st.cache_resource
+def get_listing_store():
+    # Scores, flags and GenAI results of every listing seen so far, kept across sessions
+    return ListingStore()
+
+@st.cache_resource
+def get_analysis_cache():
+    # Scores and aggregates per dataset fingerprint; widget changes only slice these
+    return AnalysisCache(max_entries=ANALYSIS_CACHE_ENTRIES)
+
+def profile_rules():
+    # Per session, from the Performance panel's checkbox
+    return st.session_state.get("profile_rules", False)
+
+def get_fingerprint(df):
+    if st.session_state.get("fingerprint") is None:
+        st.session_state.fingerprint = fingerprint_frame(df)
+    return st.session_state.fingerprint
+
 if "df" not in st.session_state:
     st.session_state.df = pd.DataFrame()
 
-def check_scam_risk(text):
-    risk_score = 0
-    text = str(text).lower()
-    red_flags = {
-        "no payment": 15, "unpaid": 15, "deposit required": 25, "send money": 25,
-        "guaranteed job": 20, "immediate start": 10, "no experience needed": 10,
-        "registration fee": 20, "training fee": 20, "investment required": 25,
-        "pay to work": 30, "application fee": 20
-    }
-    for flag, score in red_flags.items():
-        if flag in text:
-            risk_score += score
-    if re.search(r"\$\d+|\d+\s*(USD|INR|₹|dollars|rupees)", text):
-        risk_score += 25
-    return min(risk_score, 100)
-
-def generate_wordcloud(text):
+@st.cache_data(max_entries=16, show_spinner="Rendering word cloud...")
+def generate_wordcloud(fingerprint, description_column, preview, _frequencies):
+    # Cached by data fingerprint; the frequencies themselves are not hashed
     try:
-        wordcloud = WordCloud(
-            width=1000, height=600, background_color="white", colormap="Reds",
-            max_words=100, stopwords=None, contour_width=1, contour_color='steelblue'
-        ).generate(text)
-        fig, ax = plt.subplots(figsize=(12, 8))
-        ax.imshow(wordcloud, interpolation="bilinear")
-        ax.axis("off")
-        plt.tight_layout()
-        return fig
+        return render_wordcloud_png(_frequencies, preview=preview)
     except Exception as e:
         st.error(f"Word cloud generation failed: {str(e)}")
         return None
@@ -62,20 +82,57 @@ def load_data(uploaded_file):
         st.error(f"Error loading data: {str(e)}")
         return None
 
-def load_pdf_data(uploaded_file):
-    text = ""
+def load_data_streaming(uploaded_file, score=True, profile=False):
+    progress_bar = st.progress(0.0, text="Loading...")
     try:
-        pdf_reader = PdfReader(uploaded_file)
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        job_title_match = re.search(r"(?:Job Title:|Position:)\s*(.*)", text, re.IGNORECASE)
-        job_title = job_title_match.group(1).strip() if job_title_match else "N/A"
-        company_match = re.search(r"(?:Company:|Hiring at:|Organization:)\s*(.*)", text, re.IGNORECASE)
-        company = company_match.group(1).strip() if company_match else "N/A"
-        return pd.DataFrame({"Job Title": [job_title], "Companies": [company], "Description": [text]})
+        def report(rows, fraction):
+            progress_bar.progress(min(fraction or 0.0, 1.0), text=f"Loaded and scored {rows:,} rows...")
+
+        df = load_streaming(uploaded_file, uploaded_file.name, score=score, progress=report, profile=profile)
+        progress_bar.empty()
+        if not df.empty:
+            return df
+        else:
+            st.error("The file is empty")
+            return None
     except Exception as e:
+        progress_bar.empty()
+        st.error(f"Error loading data: {str(e)}")
+        return None
+
+def show_page(df, key):
+    # Only the selected page is sent to the browser
+    col1, col2 = st.columns([1, 3])
+    page_size = col1.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    pages = max(1, -(-len(df) // page_size))
+    # The page lives in session state only, so it can be clamped without a widget default
+    st.session_state[f"{key}_page"] = min(st.session_state.get(f"{key}_page", 1), pages)
+    page = col2.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key=f"{key}_page")
+    rows, page, pages = page_slice(df, page, page_size)
+    start = (page - 1) * page_size
+    st.caption(f"Rows {start + 1 if len(df) else 0:,}-{start + len(rows):,} of {len(df):,}")
+    return rows
+
+@st.cache_resource
+def get_pdf_cache():
+    return PdfTextCache()
+
+def load_pdf_data(uploaded_files):
+    progress_bar = st.progress(0.0, text="Extracting PDFs...")
+    try:
+        def report(done, total):
+            progress_bar.progress(done / total if total else 1.0, text=f"Extracted {done} of {total} PDFs...")
+
+        df, errors = load_pdfs(
+            ((uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files),
+            cache=get_pdf_cache(), progress=report
+        )
+        progress_bar.empty()
+        for name, error in errors.items():
+            st.error(f"Error reading PDF {name}: {error}")
+        return df
+    except Exception as e:
+        progress_bar.empty()
         st.error(f"Error reading PDF: {e}")
         return None
 
@@ -83,15 +140,74 @@ def load_pdf_data(uploaded_file):
 tab1, tab2, tab3 = st.tabs(["Data Upload", "Analysis Results", "Red Flags Word Cloud"])
 with tab1:
     st.header("Upload Your Data")
-    uploaded_file = st.file_uploader("Choose a file (CSV, Excel, or PDF)", type=["csv", "xls", "xlsx", "pdf"])
-    if uploaded_file:
-        if uploaded_file.name.endswith(".pdf"):
-            df = load_pdf_data(uploaded_file)
+    uploaded_files = st.file_uploader(
+        "Choose a file (CSV or Excel), or any number of PDFs and ZIP archives of PDFs",
+        type=["csv", "xls", "xlsx", "pdf", "zip"],
+        accept_multiple_files=True
+    )
+    if uploaded_files:
+        pdf_files = [f for f in uploaded_files if f.name.lower().endswith((".pdf", ".zip"))]
+        table_files = [f for f in uploaded_files if not f.name.lower().endswith((".pdf", ".zip"))]
+        streaming = False
+        if len(table_files) == 1 and not pdf_files:
+            streaming = st.checkbox(
+                "Streaming mode for large files",
+                value=table_files[0].size > STREAMING_THRESHOLD_BYTES,
+                help=f"Reads the file in chunks, keeps only {', '.join(NEEDED_COLUMNS)} "
+                     "(when a Description column exists) and scores rows as they load."
+            )
+        use_store = st.checkbox(
+            "Merge into the listing store", value=True,
+            help="Listings seen in earlier uploads keep their stored scores, flags and GenAI results; "
+                 "only new listings are scored."
+        )
+        # Only parse the upload again when the files or the loading mode change
+        source_id = (tuple((f.name, f.size, getattr(f, "file_id", None)) for f in uploaded_files), streaming, use_store)
+        # Listings loaded from the store replace the upload until the files change
+        if st.session_state.get("source_id") == source_id:
+            df = st.session_state.df
         else:
-            df = load_data(uploaded_file)
-        if df is not None and not df.empty:
+            started = time.perf_counter()
+            if pdf_files and not table_files:
+                df = load_pdf_data(pdf_files)
+            elif len(table_files) == 1 and not pdf_files:
+                df = (load_data_streaming(table_files[0], score=not use_store, profile=profile_rules()) if streaming
+                      else load_data(table_files[0]))
+            else:
+                st.error("Upload either a single CSV/Excel file or PDF/ZIP files, not a mix.")
+                df = None
+            METRICS.record("parse_upload", time.perf_counter() - started, len(df) if df is not None else None)
+            if df is not None and not df.empty and use_store:
+                text_columns = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
+                store_column = "Description" if "Description" in df.columns else (text_columns or [None])[0]
+                if store_column is not None:
+                    with st.spinner("Merging into the listing store..."), METRICS.stage("listing_store_merge", rows=len(df)):
+                        ruleset = get_ruleset()
+                        stored, merge_summary = get_listing_store().merge(df, store_column, ruleset, profile_rules())
+                    for column in stored.columns:
+                        df[column] = stored[column].to_numpy()
+                    # Lets the analysis reuse the stored scores instead of rescoring
+                    df.attrs.update(scored_column=store_column, ruleset_digest=ruleset.digest)
+                    st.session_state.store_summary = merge_summary
+            if df is not None and not df.empty:
+                st.session_state.source_id = source_id
+                st.session_state.fingerprint = fingerprint_bytes(f.getvalue() for f in uploaded_files)
+                st.session_state.loaded_from_store = False
+        if st.session_state.get("loaded_from_store"):
+            st.info("Analyzing listings loaded from the store instead of this upload.")
+            if st.button("Analyze the upload instead"):
+                st.session_state.source_id = None
+                st.session_state.loaded_from_store = False
+                st.rerun()
+        elif df is not None and not df.empty:
             st.session_state.df = df
             st.success("Data loaded successfully!")
+            if use_store and st.session_state.get("store_summary"):
+                merge_summary = st.session_state.store_summary
+                st.caption(
+                    f"Listing store: {merge_summary['new']} new listings scored, {merge_summary['rescored']} "
+                    f"rescored for a newer ruleset, {merge_summary['reused']} reused from earlier uploads"
+                )
             col1, col2, col3 = st.columns(3)
             col1.metric("Total Listings", len(df))
             text_cols = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
@@ -101,6 +217,26 @@ with tab1:
         else:
             st.warning("Could not load data from the file.")
 
+    store = get_listing_store()
+    if store.count():
+        with st.expander(f"Browse the listing store ({store.count():,} listings)"):
+            store_min_score = st.slider("Minimum Risk Score", 0, 100, 40, key="store_min_score")
+            store_levels = st.multiselect("Risk Level", ["Low", "Medium", "High"], default=["High", "Medium"],
+                                          key="store_levels")
+            store_companies = st.multiselect("Companies (all if empty)", store.companies(), key="store_companies")
+            store_limit = st.number_input("Maximum rows", min_value=1, value=1000, key="store_limit")
+            stored_df = store.query(store_min_score, store_levels, store_companies or None, limit=store_limit)
+            st.dataframe(stored_df.drop(columns=["Ruleset Version", "Ruleset Digest"]), use_container_width=True)
+            if not stored_df.empty and st.button("Analyze these listings"):
+                current = (stored_df["Ruleset Digest"] == get_ruleset().digest).all()
+                stored_df = stored_df.drop(columns=["Ruleset Version", "Ruleset Digest"])
+                if current:
+                    stored_df.attrs.update(scored_column="Description", ruleset_digest=get_ruleset().digest)
+                st.session_state.df = stored_df
+                st.session_state.fingerprint = None
+                st.session_state.loaded_from_store = True
+                st.success(f"Loaded {len(stored_df)} stored listings; see the Analysis Results tab.")
+
 # TAB 2: Analysis
 with tab2:
     st.header("Analysis Results")
@@ -119,22 +255,85 @@ with tab2:
             st.error("No text columns found for analysis")
             st.stop()
 
+        dedupe = st.checkbox(
+            "Group near-duplicate listings", value=True,
+            help="Reposts with small edits (company name, amount) are grouped; every listing keeps its "
+                 "own rule score, but only one listing per group is sent to GenAI."
+        )
+        ruleset = get_ruleset()
+        analysis = get_analysis_cache().get(df, get_fingerprint(df), description_column, ruleset, dedupe, profile_rules())
+        df["Risk Score"] = analysis.scores
+        df["Risk Level"] = analysis.levels
+        df.drop(columns="Cluster Size", errors="ignore", inplace=True)
+        if analysis.clusters is not None:
+            df["Cluster Size"] = analysis.clusters.sizes
+            st.caption(
+                f"Scored with ruleset version {ruleset.version} ({ruleset.digest[:8]}): {analysis.clusters.n_clusters} distinct "
+                f"listings, {analysis.clusters.duplicate_rows} near-duplicates"
+            )
+        else:
+            st.caption(f"Scored with ruleset version {ruleset.version} ({ruleset.digest[:8]})")
+
         use_genai = st.checkbox("Use GenAI for deeper analysis", value=False)
         if use_genai:
+            escalation = st.radio(
+                "Send to GenAI:",
+                ["Uncertain rule scores", "Top-K by rule score", "All listings"],
+                horizontal=True,
+                help="Only escalated listings are sent to the LLM; the rest keep their rule-based score."
+            )
+            band, top_k = None, None
+            if escalation == "Uncertain rule scores":
+                band = st.slider("Uncertainty band (rule score)", 0, 100, DEFAULT_BAND)
+            elif escalation == "Top-K by rule score":
+                top_k = st.number_input("K", min_value=1, max_value=len(df), value=min(50, len(df)))
+            structured = st.checkbox(
+                "Structured verdicts (batched)", value=True,
+                help="Send several listings per request and get verdict, score and indicators columns."
+            )
             with st.spinner("Running GenAI analysis..."):
                 openai_api_key = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
                 if not openai_api_key:
                     st.error("OpenAI API key not found. Please set it in secrets or environment variables.")
                 else:
-                    df["GenAI Analysis"] = df[description_column].apply(lambda text: analyze_with_genai(text, openai_api_key))
-
-        df["Risk Score"] = df[description_column].apply(check_scam_risk)
-        df["Risk Level"] = pd.cut(df["Risk Score"], bins=[0, 30, 70, 100], labels=["Low", "Medium", "High"], right=False)
+                    # Listings with stored (or earlier) results for this mode are not sent again
+                    result_column = "GenAI Verdict" if structured else "GenAI Analysis"
+                    analyzed = df[result_column].notna() if result_column in df.columns else None
+                    results, summary = triage_analyze(
+                        df[description_column], openai_api_key,
+                        scores=df["Risk Score"], band=band, top_k=top_k, structured=structured,
+                        clusters=analysis.clusters, exclude=analyzed,
+                        concurrency=GENAI_CONCURRENCY,
+                        requests_per_minute=GENAI_REQUESTS_PER_MINUTE,
+                        tokens_per_minute=GENAI_TOKENS_PER_MINUTE,
+                        cache=get_genai_cache(),
+                    )
+                    # Only rows sent this run change; the others keep their stored results
+                    escalated = results["Escalated"].to_numpy()
+                    for column in results.columns.drop("Escalated"):
+                        if column in df.columns:
+                            df[column] = df[column].mask(escalated, results[column])
+                        else:
+                            df[column] = results[column]
+                    if "Listing Key" in df.columns:
+                        get_listing_store().update_genai(df["Listing Key"][escalated], results[escalated])
+                    failed = results["GenAI Error"].notna().sum()
+                    if failed:
+                        st.warning(f"GenAI analysis failed for {failed} of {summary['escalated']} listings; see the 'GenAI Error' column.")
+                    stats = get_genai_cache().stats()
+                    st.caption(
+                        f"GenAI: {summary['escalated']} of {summary['rows']} listings escalated, "
+                        f"{summary['sent']} sent after grouping near-duplicates, "
+                        f"{summary['already_analyzed']} already analyzed, "
+                        f"{summary['cached']} served from cache, "
+                        f"{summary['calls_saved']} of {summary['rows']} LLM calls saved "
+                        f"({stats['hits']} hits / {stats['misses']} misses this session, {stats['entries']} stored)"
+                    )
 
         st.subheader("Final Results Table")
-        expected_cols = ["Job Title", "Companies", description_column, "Risk Score", "Risk Level", "GenAI Analysis"]
+        expected_cols = ["Job Title", "Companies", description_column, "Risk Score", "Risk Level", "Cluster Size", "GenAI Verdict", "GenAI Score", "GenAI Indicators", "GenAI Analysis", "GenAI Error"]
         available_cols = [col for col in expected_cols if col in df.columns]
-        st.dataframe(df[available_cols], use_container_width=True)
+        st.dataframe(show_page(df[available_cols], "final"), use_container_width=True)
 
         # **New: Column selection for Job Title/Position**
         job_title_column = None
@@ -159,87 +358,120 @@ with tab2:
         viz_tab1, viz_tab2, viz_tab3 = st.tabs(["By Position", "By Company", "Risk Distribution"])
 
         with viz_tab1:
-            # Position-wise risk chart
-            x_axis_label = job_title_column if job_title_column else df.index
-            fig1 = px.bar(
-                df.sort_values("Risk Score", ascending=False),
-                x=x_axis_label,
-                y="Risk Score",
-                color="Risk Level",
-                color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
-                hover_data=[description_column, "Companies"] if "Companies" in df.columns else [description_column],
-                title="Risk Scores by Position",
-                labels={"Risk Score": "Risk Score (%)", x_axis_label: "Position" if isinstance(x_axis_label, str) else "Index"},
-                height=600
-            )
-            fig1.update_layout(
-                xaxis_title="Position" if isinstance(x_axis_label, str) else "Index",
-                yaxis_range=[0, 100],
-                hovermode="closest"
-            )
-            st.plotly_chart(fig1, use_container_width=True)
+            # Position-wise risk chart, aggregated and limited to the top N before plotting
+            col1, col2 = st.columns(2)
+            if job_title_column:
+                position_view = col1.radio("Show", ["Average by position", "Top listings"], horizontal=True)
+            else:
+                position_view = "Top listings"
+            top_n = col2.number_input("Top N", min_value=1, max_value=MAX_TOP_N, value=TOP_N)
+            with METRICS.stage("plotly_by_position"):
+                if position_view == "Average by position":
+                    position_df = position_summary(df, analysis.scores, analysis.levels, job_title_column, top_n)
+                    fig1 = px.bar(
+                        position_df,
+                        x="Position",
+                        y="Avg_Risk",
+                        color="Risk Level",
+                        color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
+                        hover_data=["Max_Risk", "Count", "High_Risk"],
+                        title=f"Average Risk Score of the {len(position_df)} Riskiest Positions",
+                        labels={"Avg_Risk": "Average Risk Score (%)", "Max_Risk": "Highest Risk Score",
+                                "Count": "Listings", "High_Risk": "High Risk Listings"},
+                        height=600
+                    )
+                else:
+                    listings_df = top_listings(df, analysis.order, analysis.scores, analysis.levels,
+                                               job_title_column, description_column, top_n)
+                    fig1 = px.bar(
+                        listings_df,
+                        x="Listing",
+                        y="Risk Score",
+                        color="Risk Level",
+                        color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
+                        hover_data=["Description", "Companies"] if "Companies" in listings_df.columns else ["Description"],
+                        title=f"Risk Scores of the {len(listings_df)} Riskiest Listings",
+                        labels={"Risk Score": "Risk Score (%)"},
+                        height=600
+                    )
+                fig1.update_layout(
+                    xaxis_title="Position" if job_title_column else "Index",
+                    yaxis_range=[0, 100],
+                    hovermode="closest"
+                )
+                st.plotly_chart(fig1, use_container_width=True)
 
         with viz_tab2:
             if "Companies" in df.columns:
                 # Company-wise analysis
-                company_stats = df.groupby("Companies").agg(
-                    Avg_Risk=("Risk Score", "mean"),
-                    Count=("Risk Score", "count"),
-                    High_Risk=("Risk Level", lambda x: sum(x == "High"))
-                )
-                company_stats = company_stats.sort_values("Avg_Risk", ascending=False)
-
-                fig2 = px.scatter(
-                    company_stats,
-                    x="Count",
-                    y="Avg_Risk",
-                    size="High_Risk",
-                    color="Avg_Risk",
-                    color_continuous_scale="reds",
-                    hover_name=company_stats.index,
-                    title="Company Risk Profile (Size = High Risk Count)",
-                    labels={"Avg_Risk": "Average Risk", "Count": "Listings Count", "Companies": "Company"},
-                    height=600
-                )
-                fig2.update_layout(
-                    yaxis_range=[0, 100],
-                    xaxis_range=[0, company_stats["Count"].max() * 1.1] if company_stats["Count"].max() > 0 else None
-                )
-                st.plotly_chart(fig2, use_container_width=True)
+                company_stats = analysis.company_stats
+
+                with METRICS.stage("plotly_by_company"):
+                    fig2 = px.scatter(
+                        company_stats,
+                        x="Count",
+                        y="Avg_Risk",
+                        size="High_Risk",
+                        color="Avg_Risk",
+                        color_continuous_scale="reds",
+                        hover_name=company_stats.index,
+                        hover_data=["Clusters", "Largest_Cluster"] if analysis.clusters is not None else None,
+                        title="Company Risk Profile (Size = High Risk Count)",
+                        labels={"Avg_Risk": "Average Risk", "Count": "Listings Count", "Companies": "Company"},
+                        height=600
+                    )
+                    fig2.update_layout(
+                        yaxis_range=[0, 100],
+                        xaxis_range=[0, company_stats["Count"].max() * 1.1] if company_stats["Count"].max() > 0 else None
+                    )
+                    st.plotly_chart(fig2, use_container_width=True)
             else:
                 st.info("Company information not available for this analysis")
 
+            if analysis.cluster_stats is not None:
+                st.markdown("**Reposted listings** (near-duplicate groups, largest first)")
+                if analysis.cluster_stats.empty:
+                    st.info("No near-duplicate listings found.")
+                else:
+                    st.dataframe(analysis.cluster_stats.drop(columns="Representative").head(100), use_container_width=True)
+
         with viz_tab3:
             # Risk distribution visualization
             col1, col2 = st.columns(2)
 
             with col1:
                 # Pie chart
-                risk_dist = df["Risk Level"].value_counts().reset_index()
-                risk_dist.columns = ["Risk Level", "count"]
-                fig3 = px.pie(
-                    risk_dist,
-                    values="count",
-                    names="Risk Level",
-                    color="Risk Level",
-                    color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
-                    hole=0.3,
-                    title="Risk Level Distribution"
-                )
-                st.plotly_chart(fig3, use_container_width=True)
+                risk_dist = analysis.risk_dist
+                with METRICS.stage("plotly_risk_levels"):
+                    fig3 = px.pie(
+                        risk_dist,
+                        values="count",
+                        names="Risk Level",
+                        color="Risk Level",
+                        color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
+                        hole=0.3,
+                        title="Risk Level Distribution"
+                    )
+                    st.plotly_chart(fig3, use_container_width=True)
 
             with col2:
                 # Histogram
-                fig4 = px.histogram(
-                    df,
-                    x="Risk Score",
-                    nbins=20,
-                    color="Risk Level",
-                    color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
-                    title="Risk Score Distribution",
-                    labels={"Risk Score": "Risk Score (%)"}
-                )
-                st.plotly_chart(fig4, use_container_width=True)
+                with METRICS.stage("plotly_risk_histogram"):
+                    # Binned here so only the bin counts reach the browser
+                    histogram = score_histogram(analysis.scores, analysis.levels)
+                    fig4 = px.bar(
+                        histogram,
+                        x="Bin Center",
+                        y="count",
+                        color="Risk Level",
+                        color_discrete_map={"Low": "#2ecc71", "Medium": "#f39c12", "High": "#e74c3c"},
+                        hover_data={"Bin Start": True, "Bin End": True, "Bin Center": False},
+                        title="Risk Score Distribution",
+                        labels={"Bin Center": "Risk Score (%)"}
+                    )
+                    fig4.update_traces(width=100 / HISTOGRAM_BINS)
+                    fig4.update_layout(bargap=0, xaxis_range=[0, 100])
+                    st.plotly_chart(fig4, use_container_width=True)
 
         # Detailed Results Section
         st.subheader("Detailed Analysis Results")
@@ -254,10 +486,12 @@ with tab2:
             )
 
         # Apply filters
-        filtered_df = df[
-            (df["Risk Score"] >= min_score) &
-            (df["Risk Level"].isin(risk_level))
-        ].sort_values("Risk Score", ascending=False)
+        # Slice the precomputed order instead of re-sorting on every widget change
+        ranked_df = df.iloc[analysis.order]
+        filtered_df = ranked_df[
+            (ranked_df["Risk Score"] >= min_score) &
+            (ranked_df["Risk Level"].isin(risk_level))
+        ]
 
         # Show metrics
         col1, col2, col3 = st.columns(3)
@@ -267,24 +501,26 @@ with tab2:
         high_risk_count = sum(filtered_df['Risk Level'] == 'High') if not filtered_df.empty else 0
         col3.metric("High Risk", f"{high_risk_count}")
 
-        # Display results
-        st.dataframe(
-            filtered_df.style.applymap(
-                lambda x: "background-color: #ffe6e6" if x == "High" else
-                          ("background-color: #fff2e6" if x == "Medium" else ""),
-                subset=["Risk Level"]
-            ),
-            column_config={
-                "Risk Score": st.column_config.ProgressColumn(
-                    "Risk Score",
-                    format="%d%%",
-                    min_value=0,
-                    max_value=100
-                )
-            },
-            use_container_width=True,
-            height=600
-        )
+        # Display results; only the visible page is styled and sent
+        page_df = show_page(filtered_df, "results")
+        with METRICS.stage("results_table", rows=len(page_df)):
+            st.dataframe(
+                page_df.style.map(
+                    lambda x: "background-color: #ffe6e6" if x == "High" else
+                              ("background-color: #fff2e6" if x == "Medium" else ""),
+                    subset=["Risk Level"]
+                ),
+                column_config={
+                    "Risk Score": st.column_config.ProgressColumn(
+                        "Risk Score",
+                        format="%d%%",
+                        min_value=0,
+                        max_value=100
+                    )
+                },
+                use_container_width=True,
+                height=600
+            )
 
 with tab3:
     st.header("Red Flags Analysis")
@@ -314,43 +550,40 @@ with tab3:
         # Enhanced word cloud section
         st.subheader("Word Cloud of Common Terms")
 
-        all_text = " ".join(df[description_column].astype(str))
-        wc_fig = generate_wordcloud(all_text)
+        # Shares the cache entry of the Analysis Results tab, so the dataset is not analyzed twice
+        analysis = get_analysis_cache().get(df, get_fingerprint(df), description_column, get_ruleset(),
+                                            profile=profile_rules())
+        preview = st.toggle("Fast preview", value=True, help="Render a smaller image with fewer words.")
+        wc_png = generate_wordcloud(
+            get_fingerprint(df), description_column, preview, frequencies_from_index(analysis.term_index)
+        )
 
-        if wc_fig:
-            st.pyplot(wc_fig)
+        if wc_png:
+            st.image(wc_png, use_container_width=not preview)
         else:
             st.warning("Could not generate word cloud")
 
         # Term frequency analysis
         st.subheader("Red Flag Term Frequency")
 
-        red_flag_terms = [
-            "payment", "deposit", "fee", "unpaid", "money",
-            "investment", "registration", "training", "guaranteed",
-            "required", "pay", "send", "secure", "opportunity"
-        ]
-
-        term_counts = {}
-        for term in red_flag_terms:
-            term_counts[term] = sum(
-                bool(re.search(rf"\b{re.escape(term)}\b", text.lower()))
-                for text in df[description_column].astype(str)
-            )
-
-        term_df = pd.DataFrame.from_dict(term_counts, orient="index", columns=["Count"])
-        term_df = term_df.sort_values("Count", ascending=False)
-
-        fig5 = px.bar(
-            term_df,
-            x=term_df.index,
-            y="Count",
-            color="Count",
-            color_continuous_scale="reds",
-            title="Red Flag Term Frequency",
-            labels={"index": "Term", "Count": "Occurrences"}
+        custom_terms = st.text_input(
+            "Custom terms (comma-separated, optional)",
+            help="Counted from the precomputed word index, so changing them does not rescan the data."
         )
-        st.plotly_chart(fig5, use_container_width=True)
+        terms = [term.strip() for term in custom_terms.split(",") if term.strip()]
+        term_df = analysis.term_index.counts(terms) if terms else analysis.term_counts
+
+        with METRICS.stage("plotly_term_frequency"):
+            fig5 = px.bar(
+                term_df,
+                x=term_df.index,
+                y="Count",
+                color="Count",
+                color_continuous_scale="reds",
+                title="Red Flag Term Frequency",
+                labels={"index": "Term", "Count": "Occurrences"}
+            )
+            st.plotly_chart(fig5, use_container_width=True)
 
         # Show examples for selected term
         selected_term = st.selectbox(
@@ -362,15 +595,64 @@ with tab3:
         if description_column not in df.columns:
             st.warning("Description column not found in data")
         else:
-            examples = df[
-                df[description_column].str.contains(selected_term, case=False, na=False)
-            ][[description_column, "Risk Score", "Risk Level"]]
+            examples = df.iloc[analysis.term_index.rows(selected_term)][[description_column, "Risk Score", "Risk Level"]]
 
             if not examples.empty:
                 st.subheader(f"Examples containing '{selected_term}'")
-                st.dataframe(examples, use_container_width=True)
+                st.dataframe(show_page(examples, "examples"), use_container_width=True)
             else:
                 st.info(f"No examples found containing '{selected_term}'")
     else:
         st.warning("No description data available for analysis")
 
+# Performance panel; rendered last so it includes this run's timings
+with st.expander("Performance"):
+    snapshot = METRICS.snapshot()
+    st.caption(
+        f"Collected since {pd.Timestamp(snapshot['since'], unit='s'):%Y-%m-%d %H:%M:%S} UTC "
+        "across all sessions of this server."
+    )
+    if snapshot["stages"]:
+        stages = pd.DataFrame.from_dict(snapshot["stages"], orient="index").sort_values("seconds", ascending=False)
+        stages["mean_ms"] = stages["seconds"] / stages["calls"] * 1000
+        st.markdown("**Stages**")
+        st.dataframe(
+            stages[["calls", "seconds", "mean_ms", "max_seconds", "rows", "rows_per_sec"]],
+            column_config={
+                "seconds": st.column_config.NumberColumn("Total (s)", format="%.3f"),
+                "mean_ms": st.column_config.NumberColumn("Mean (ms)", format="%.1f"),
+                "max_seconds": st.column_config.NumberColumn("Max (s)", format="%.3f"),
+                "rows_per_sec": st.column_config.NumberColumn("Rows/s", format="%.0f"),
+            },
+            use_container_width=True
+        )
+    else:
+        st.info("Nothing measured yet.")
+    if snapshot["counters"]:
+        st.markdown("**Counters**")
+        st.dataframe(pd.Series(snapshot["counters"], name="value"), use_container_width=True)
+
+    st.checkbox(
+        "Profile individual rules", key="profile_rules",
+        help="Times every rule's patterns in this session's next scoring runs; adds overhead while enabled. "
+             "Cached analyses are not rescored, so upload new data or edit the rules to measure."
+    )
+    if snapshot["rules"]:
+        st.markdown("**Rules** (slowest first)")
+        st.dataframe(
+            pd.DataFrame.from_dict(snapshot["rules"], orient="index"),
+            column_config={
+                "seconds": st.column_config.NumberColumn("Total (s)", format="%.4f"),
+                "us_per_call": st.column_config.NumberColumn("µs per text", format="%.2f"),
+            },
+            use_container_width=True
+        )
+
+    col1, col2, col3 = st.columns(3)
+    col1.download_button("Export JSON", METRICS.to_json(), file_name="scamternship_metrics.json",
+                         mime="application/json")
+    col2.download_button("Export Prometheus", METRICS.to_prometheus(), file_name="scamternship_metrics.prom",
+                         mime="text/plain")
+    if col3.button("Reset"):
+        METRICS.reset()
+        st.rerun()
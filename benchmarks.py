@@ -0,0 +1,346 @@
+"""
+Benchmarks for the scoring and ingestion hot paths.
+
+Each benchmark runs on a synthetic corpus from synthetic_corpus.py and reports
+rows/sec and peak Python memory (tracemalloc), compared with a stored baseline.
+The exit status is 1 when anything regressed beyond the tolerance, so the
+suite can gate rule changes in CI.
+
+Example:
+    python benchmarks.py --save-baseline    # record this machine's numbers
+    python benchmarks.py                    # compare against them
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+import synthetic_corpus
+
+DEFAULT_BASELINE_PATH = os.environ.get(
+    "BENCHMARK_BASELINE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"),
+)
+# Allowed slowdown in rows/sec, and growth in peak memory, before a run fails
+TOLERANCE = 0.25
+# Memory growth below this is noise, whatever the ratio
+MIN_MEMORY_DELTA_MB = 2.0
+# (fast, reference) pairs measured in the same run: the fast path must not be slower
+SAME_RUN_CHECKS = [("risk_scoring.score_batch", "risk_scoring.check_scam_risk")]
+
+
+def _score_each(check_scam_risk, texts):
+    return lambda: [check_scam_risk(text) for text in texts]
+
+
+def _bench_scam_analysis(corpus):
+    from scam_analysis import check_scam_risk
+
+    return _score_each(check_scam_risk, corpus["listings"]["Description"].tolist()), len(corpus["listings"])
+
+
+def _bench_dashboard_scoring(corpus):
+    from risk_scoring import check_scam_risk
+
+    return _score_each(check_scam_risk, corpus["listings"]["Description"].tolist()), len(corpus["listings"])
+
+
+def _bench_score_batch(corpus):
+    from risk_scoring import score_batch
+
+    return lambda: score_batch(corpus["listings"]["Description"]), len(corpus["listings"])
+
+
+def _bench_long_texts(corpus):
+    from scam_analysis import check_scam_risk
+
+    return _score_each(check_scam_risk, corpus["long_texts"]), len(corpus["long_texts"])
+
+
+def _bench_load_csv(corpus):
+    # Same call as the dashboard's load_data for CSV uploads
+    data = corpus["csv"]
+    return lambda: pd.read_csv(io.BytesIO(data), skipinitialspace=True), len(corpus["listings"])
+
+
+def _bench_load_excel(corpus):
+    # Same call as the dashboard's load_data for Excel uploads
+    data = corpus["xlsx"]
+    return lambda: pd.read_excel(io.BytesIO(data)), corpus["xlsx_rows"]
+
+
+def _bench_load_streaming(corpus):
+    from ingestion import load_streaming
+
+    data = corpus["csv"]
+    return lambda: load_streaming(io.BytesIO(data), "listings.csv"), len(corpus["listings"])
+
+
+def _bench_load_pdfs(corpus):
+    from pdf_ingestion import load_pdfs
+
+    pdfs = corpus["pdfs"]
+    return lambda: load_pdfs(pdfs), corpus["pdf_rows"]
+
+
+def _bench_term_counts(corpus):
+    from analysis_cache import RED_FLAG_TERMS
+    from term_index import TermIndex
+
+    texts = corpus["listings"]["Description"]
+    return lambda: TermIndex.build(texts).counts(RED_FLAG_TERMS), len(texts)
+
+
+def _bench_wordcloud(corpus):
+    from term_index import TermIndex
+    from wordcloud_render import frequencies_from_index, render_wordcloud_png
+
+    texts = corpus["listings"]["Description"]
+    index = TermIndex.build(texts)
+    return lambda: render_wordcloud_png(frequencies_from_index(index)), len(texts)
+
+
+# name -> setup(corpus) returning (callable, rows processed per call)
+BENCHMARKS = {
+    "scam_analysis.check_scam_risk": _bench_scam_analysis,
+    "risk_scoring.check_scam_risk": _bench_dashboard_scoring,
+    "risk_scoring.score_batch": _bench_score_batch,
+    "check_scam_risk long texts": _bench_long_texts,
+    "load_data csv": _bench_load_csv,
+    "load_data excel": _bench_load_excel,
+    "load_streaming csv": _bench_load_streaming,
+    "load_pdf_data": _bench_load_pdfs,
+    "term counts": _bench_term_counts,
+    "word cloud": _bench_wordcloud,
+}
+
+
+def build_corpus(rows, seed=0, pdf_rows=None, xlsx_rows=None, long_texts=5, long_words=50_000):
+    """
+    Generates every input the benchmarks need.
+
+    Args:
+        rows (int): Listings in the main corpus.
+        seed (int): Random seed.
+        pdf_rows (int, optional): Postings rendered to PDFs; defaults to rows // 20.
+        xlsx_rows (int, optional): Listings written to the Excel file; defaults to rows // 4.
+        long_texts (int): Number of pathological long descriptions.
+        long_words (int): Words per long description.
+
+    Returns:
+        dict: Listings, CSV/XLSX bytes, PDFs and long texts.
+    """
+    pdf_rows = pdf_rows if pdf_rows is not None else max(rows // 20, 10)
+    xlsx_rows = xlsx_rows if xlsx_rows is not None else max(rows // 4, 10)
+    listings = synthetic_corpus.generate_listings(rows, seed=seed)
+    long_rng = random.Random(seed + 1)
+    corpus = {
+        "listings": listings,
+        "csv": listings.to_csv(index=False).encode("utf-8"),
+        "xlsx_rows": xlsx_rows,
+        "long_texts": [synthetic_corpus.generate_long_description(long_rng, long_words) for _ in range(long_texts)],
+        "pdf_rows": pdf_rows,
+    }
+    buffer = io.BytesIO()
+    listings.head(xlsx_rows).to_excel(buffer, index=False)
+    corpus["xlsx"] = buffer.getvalue()
+    try:
+        corpus["pdfs"] = synthetic_corpus.generate_pdfs(listings.head(pdf_rows))
+    except ImportError:
+        corpus["pdfs"] = None
+    return corpus
+
+
+def measure(func, repeat=3):
+    """
+    Times a callable and records its peak Python memory.
+
+    The time is the best of `repeat` runs without tracing; memory comes from
+    one extra run under tracemalloc, which would otherwise distort the timing.
+
+    Args:
+        func (callable): The work to measure.
+        repeat (int): Timed runs.
+
+    Returns:
+        tuple: (seconds, peak_bytes)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(corpus, names=None, repeat=3):
+    """
+    Runs the selected benchmarks.
+
+    Args:
+        corpus (dict): Inputs from `build_corpus`.
+        names (list, optional): Benchmarks to run; all by default.
+        repeat (int): Timed runs per benchmark.
+
+    Returns:
+        dict: name -> {"rows", "seconds", "rows_per_sec", "peak_mb"}; skipped
+            benchmarks have a "skipped" reason instead.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        if name == "load_pdf_data" and corpus["pdfs"] is None:
+            results[name] = {"skipped": "reportlab is not installed"}
+            continue
+        func, rows = BENCHMARKS[name](corpus)
+        seconds, peak = measure(func, repeat)
+        results[name] = {
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+            "peak_mb": round(peak / 2**20, 2),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Finds benchmarks that got slower or hungrier than the baseline.
+
+    Args:
+        results (dict): Output of `run_benchmarks`.
+        baseline (dict): A previous output of `run_benchmarks`.
+        tolerance (float): Allowed relative slowdown and memory growth.
+
+    Returns:
+        dict: name -> list of regression messages, for regressed benchmarks only.
+    """
+    regressions = {}
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or "skipped" in result or "skipped" in before:
+            continue
+        problems = []
+        if result["rows_per_sec"] < before["rows_per_sec"] * (1 - tolerance):
+            problems.append(f"throughput {result['rows_per_sec']:,.0f} rows/s vs {before['rows_per_sec']:,.0f}")
+        growth = result["peak_mb"] - before["peak_mb"]
+        if growth > MIN_MEMORY_DELTA_MB and result["peak_mb"] > before["peak_mb"] * (1 + tolerance):
+            problems.append(f"peak memory {result['peak_mb']} MB vs {before['peak_mb']} MB")
+        if problems:
+            regressions[name] = problems
+    return regressions
+
+
+def compare_paths(results, checks=SAME_RUN_CHECKS, tolerance=0.05):
+    """
+    Finds batch paths that are slower than the per-row path they replace.
+
+    Unlike `compare`, this needs no stored baseline: both sides come from the
+    same run on the same machine.
+
+    Args:
+        results (dict): Output of `run_benchmarks`.
+        checks (list): (fast, reference) benchmark name pairs.
+        tolerance (float): Allowed relative shortfall, for timing noise.
+
+    Returns:
+        dict: fast benchmark name -> list of messages, for failing pairs only.
+    """
+    problems = {}
+    for fast, reference in checks:
+        if fast not in results or reference not in results:
+            continue
+        if "skipped" in results[fast] or "skipped" in results[reference]:
+            continue
+        if results[fast]["rows_per_sec"] < results[reference]["rows_per_sec"] * (1 - tolerance):
+            problems[fast] = [
+                f"{results[fast]['rows_per_sec']:,.0f} rows/s, slower than {reference} "
+                f"({results[reference]['rows_per_sec']:,.0f} rows/s)"
+            ]
+    return problems
+
+
+def print_report(results, baseline=None):
+    baseline = baseline or {}
+    print(f"{'benchmark':<32} {'rows':>8} {'seconds':>9} {'rows/sec':>12} {'peak MB':>9} {'vs baseline':>12}")
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<32} skipped: {result['skipped']}")
+            continue
+        before = baseline.get(name, {})
+        change = ""
+        if before.get("rows_per_sec"):
+            change = f"{result['rows_per_sec'] / before['rows_per_sec'] - 1:+.0%}"
+        print(f"{name:<32} {result['rows']:>8,} {result['seconds']:>9.3f} {result['rows_per_sec']:>12,.0f} "
+              f"{result['peak_mb']:>9.1f} {change:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scoring and ingestion hot paths.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Listings in the synthetic corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best is kept)")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed relative regression")
+    parser.add_argument("--json", help="Also write this run's results to a file")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.rows, args.seed)
+    results = run_benchmarks(corpus, args.only, args.repeat)
+    run = {
+        "config": {"rows": args.rows, "seed": args.seed},
+        "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                        "pandas": pd.__version__},
+        "results": results,
+    }
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("config") != run["config"]:
+            print(f"Baseline was recorded with {stored.get('config')}, not {run['config']}; not comparing.")
+        else:
+            baseline = stored["results"]
+    print_report(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+    if args.save_baseline:
+        if args.only and os.path.exists(args.baseline):
+            # Keep the other benchmarks' baselines when re-recording a few
+            with open(args.baseline, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("config") == run["config"]:
+                run["results"] = {**stored["results"], **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare_paths(results)
+    if baseline is not None:
+        for name, problems in compare(results, baseline, args.tolerance).items():
+            regressions.setdefault(name, []).extend(problems)
+    for name, problems in regressions.items():
+        print(f"REGRESSION {name}: {'; '.join(problems)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from analysis_cache import RISK_BINS, RISK_LABELS
+
+TOP_N = 30
+MAX_TOP_N = 500
+HOVER_CHARS = 160
+LABEL_CHARS = 60
+HISTOGRAM_BINS = 20
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def truncate(values, width=HOVER_CHARS):
+    """
+    Shortens text for chart labels and hover boxes.
+
+    Args:
+        values (pd.Series): Text values; missing values become "".
+        width (int): Longest result in characters, including the ellipsis.
+
+    Returns:
+        pd.Series: Truncated strings, aligned with `values`.
+    """
+    text = values.astype(str).where(values.notna(), "")
+    long = text.str.len() > width
+    if not long.any():
+        return text
+    return text.where(~long, text.str.slice(0, width - 1).str.rstrip() + "…")
+
+
+def position_summary(df, scores, levels, column, top_n=TOP_N):
+    """
+    Aggregates risk per position and keeps the riskiest ones.
+
+    Args:
+        df (pd.DataFrame): Listings.
+        scores (pd.Series): Risk scores aligned with `df`.
+        levels (pd.Series): Risk levels aligned with `df`.
+        column (str): Column with the job titles.
+        top_n (int): Positions to keep, highest average risk first.
+
+    Returns:
+        pd.DataFrame: One row per position with Position, Avg_Risk, Max_Risk,
+            Count, High_Risk and the Risk Level of the average.
+    """
+    frame = pd.DataFrame({
+        "Position": df[column].astype(str).where(df[column].notna(), ""),
+        "Risk Score": scores.to_numpy(),
+        "High": (levels == "High").to_numpy(),
+    })
+    stats = frame.groupby("Position", sort=False).agg(
+        Avg_Risk=("Risk Score", "mean"),
+        Max_Risk=("Risk Score", "max"),
+        Count=("Risk Score", "size"),
+        High_Risk=("High", "sum"),
+    ).nlargest(top_n, ["Avg_Risk", "Count"])
+    stats["Risk Level"] = pd.cut(stats["Avg_Risk"], bins=RISK_BINS, labels=RISK_LABELS, right=False)
+    stats["Position"] = truncate(stats.index.to_series(), LABEL_CHARS).to_numpy()
+    return stats.reset_index(drop=True)
+
+
+def top_listings(df, order, scores, levels, column, description_column, top_n=TOP_N):
+    """
+    Picks the riskiest individual listings, with short hover text.
+
+    Args:
+        df (pd.DataFrame): Listings.
+        order (np.ndarray): Row positions sorted by descending risk.
+        scores (pd.Series): Risk scores aligned with `df`.
+        levels (pd.Series): Risk levels aligned with `df`.
+        column (str, optional): Column with the job titles; the row index is used without one.
+        description_column (str): Column with the job descriptions.
+        top_n (int): Listings to keep.
+
+    Returns:
+        pd.DataFrame: Listing (a unique label), Risk Score, Risk Level,
+            Description and, when available, Companies.
+    """
+    rows = order[:top_n]
+    labels = np.asarray(df.index[rows].astype(str), dtype=object)
+    if column is not None:
+        labels = truncate(df[column].iloc[rows], LABEL_CHARS).to_numpy() + " #" + labels
+    top = pd.DataFrame({
+        "Listing": labels,
+        "Risk Score": scores.iloc[rows].to_numpy(),
+        "Risk Level": levels.iloc[rows].to_numpy(),
+        "Description": truncate(df[description_column].iloc[rows]).to_numpy(),
+    })
+    if "Companies" in df.columns:
+        top["Companies"] = truncate(df["Companies"].iloc[rows], LABEL_CHARS).to_numpy()
+    return top
+
+
+def score_histogram(scores, levels, bins=HISTOGRAM_BINS):
+    """
+    Counts risk scores per bin and level, so only the counts are plotted.
+
+    Args:
+        scores (pd.Series): Risk scores from 0 to 100.
+        levels (pd.Series): Risk levels aligned with `scores`.
+        bins (int): Equal-width bins over 0-100.
+
+    Returns:
+        pd.DataFrame: Non-empty bins with Bin Start, Bin End, Bin Center,
+            Risk Level and count.
+    """
+    edges = np.linspace(0, 100, bins + 1)
+    values = scores.to_numpy(dtype=float)
+    level_values = np.asarray(levels)
+    counts = [np.histogram(values[level_values == level], bins=edges)[0] for level in RISK_LABELS]
+    histogram = pd.DataFrame({
+        "Bin Start": np.tile(edges[:-1], len(RISK_LABELS)),
+        "Bin End": np.tile(edges[1:], len(RISK_LABELS)),
+        "Risk Level": np.repeat(RISK_LABELS, bins),
+        "count": np.concatenate(counts),
+    })
+    histogram["Bin Center"] = (histogram["Bin Start"] + histogram["Bin End"]) / 2
+    return histogram[histogram["count"] > 0].reset_index(drop=True)
+
+
+def page_slice(df, page, page_size):
+    """
+    Returns one page of rows.
+
+    Args:
+        df (pd.DataFrame): Rows to paginate.
+        page (int): 1-based page number; clamped to the valid range.
+        page_size (int): Rows per page.
+
+    Returns:
+        tuple: (rows, page, pages) with the page's rows, the page actually
+            shown and the number of pages.
+    """
+    pages = max(1, -(-len(df) // page_size))
+    page = min(max(1, page), pages)
+    return df.iloc[(page - 1) * page_size:page * page_size], page, pages
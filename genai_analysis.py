@@ -1,37 +1,505 @@
+import asyncio
+import json
+import random
+import time
+
 import openai
-import streamlit as st
 import os
 
-def analyze_with_genai(text, api_key):
+from genai_cache import cache_key
+from instrumentation import METRICS
+
+MODEL = "gpt-3.5-turbo"  # Or another suitable model
+SYSTEM_PROMPT = "You are a helpful assistant that analyzes job descriptions for potential scam indicators. Focus on vague language, requests for money, guaranteed roles without interviews, and unusual urgency."
+TEMPERATURE = 0.7
+MAX_TOKENS = 150
+USER_PROMPT = "Analyze the following text for scam indicators: '{text}'"
+
+# Structured mode: several listings per request, one JSON verdict per listing
+STRUCTURED_PROMPT = (
+    "You are a helpful assistant that analyzes job descriptions for potential scam indicators. "
+    "Focus on vague language, requests for money, guaranteed roles without interviews, and unusual urgency. "
+    "You will receive a JSON array of listings, each with an \"id\" and a \"text\". "
+    "Reply with only a JSON array containing exactly one object per listing: "
+    "{\"id\": <the listing's id>, \"verdict\": \"scam\" | \"suspicious\" | \"legitimate\", "
+    "\"score\": <integer 0-100, higher is more likely a scam>, \"indicators\": [<short phrases>]}."
+)
+STRUCTURED_TEMPERATURE = 0.0
+STRUCTURED_FORMAT = "json-v1"
+STRUCTURED_TOKENS_PER_LISTING = 80
+VERDICTS = ("scam", "suspicious", "legitimate")
+
+# HTTP statuses worth retrying: rate limits and transient server errors
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+# Looked up defensively so an unexpected openai version gives per-row errors, not a crash
+RETRYABLE_ERRORS = (asyncio.TimeoutError,) + tuple(
+    getattr(getattr(openai, "error", None), name)
+    for name in ("Timeout", "APIConnectionError", "TryAgain", "RateLimitError", "ServiceUnavailableError")
+    if hasattr(getattr(openai, "error", None), name)
+)
+
+
+def build_messages(text):
+    """Builds the chat messages used to analyze one listing."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": USER_PROMPT.format(text=text)}
+    ]
+
+
+def request_cache_key(text):
+    """Cache key for analyzing `text` with the current model and prompt settings."""
+    return cache_key(text, MODEL, SYSTEM_PROMPT + "\n" + USER_PROMPT, TEMPERATURE, max_tokens=MAX_TOKENS)
+
+
+def estimate_tokens(messages, max_tokens=MAX_TOKENS):
+    """Rough token count for a request (about 4 characters per token, plus the reply)."""
+    return sum(len(message["content"]) for message in messages) // 4 + len(messages) * 4 + max_tokens
+
+
+def analyze_with_genai(text, api_key, cache=None):
     """
     Analyzes text using OpenAI's GPT model for potential scam indicators.
-    Now accepts the API key as an argument.
+    Now accepts the API key as an argument, and an optional GenAICache.
     """
     try:
         if not api_key:
+            import streamlit as st  # Imported here so headless callers don't need streamlit
+
             st.warning("OpenAI API key is not provided to the analysis function.")
             return "API key not provided"
 
+        key = request_cache_key(text) if cache is not None else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                METRICS.incr("genai_cache_hits")
+                return cached
+            METRICS.incr("genai_cache_misses")
+
         openai.api_key = api_key  # Set the API key within the function's scope
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",  # Or another suitable model
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that analyzes job descriptions for potential scam indicators. Focus on vague language, requests for money, guaranteed roles without interviews, and unusual urgency."},
-                {"role": "user", "content": f"Analyze the following text for scam indicators: '{text}'"}
-            ],
-            temperature=0.7,
-            max_tokens=150,
-            n=1,
-            stop=None,
-        )
-        return response.choices[0].message.content.strip()
+        METRICS.incr("llm_calls")
+        with METRICS.stage("genai_request"):
+            response = openai.ChatCompletion.create(
+                model=MODEL,
+                messages=build_messages(text),
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                n=1,
+                stop=None,
+            )
+        _count_tokens(response)
+        analysis = response.choices[0].message.content.strip()
+        if cache is not None:
+            cache.set(key, analysis)
+        return analysis
     except Exception as e:
+        METRICS.incr("llm_errors")
         return f"Error during GenAI analysis: {e}"
 
+
+def _count_tokens(response):
+    """Adds the tokens a completion reports to the `llm_tokens` counter."""
+    try:
+        METRICS.incr("llm_tokens", int(response["usage"]["total_tokens"]))
+    except (KeyError, TypeError, ValueError):
+        pass
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at a per-minute rate.
+
+    Args:
+        rate_per_minute (float): Tokens added per minute.
+        capacity (float, optional): Maximum burst; defaults to one minute's worth.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount=1):
+        """Waits until `amount` tokens are available, then takes them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+def _is_retryable(error):
+    """Returns True for rate limits, timeouts and transient server errors."""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return getattr(error, "http_status", None) in RETRYABLE_STATUSES
+
+
+def _retry_after(error):
+    """Returns the server's Retry-After delay in seconds, if it sent one."""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _RequestRunner:
+    """Concurrency, rate limits and retry policy shared by the requests of one run."""
+
+    def __init__(self, api_key, concurrency=8, requests_per_minute=None, tokens_per_minute=None,
+                 max_retries=5, base_delay=1.0, max_delay=60.0, api_base=None, request_timeout=60):
+        self.api_key = api_key
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.api_base = api_base
+        self.request_timeout = request_timeout
+
+    async def complete(self, messages, temperature=TEMPERATURE, max_tokens=MAX_TOKENS):
+        """
+        Sends one chat request, retrying transient failures, and never raises.
+
+        Returns:
+            dict: "content" (str or None), "error" (str or None) and "attempts".
+        """
+        tokens = estimate_tokens(messages, max_tokens)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.semaphore:
+                    if self.request_bucket is not None:
+                        await self.request_bucket.acquire(1)
+                    if self.token_bucket is not None:
+                        await self.token_bucket.acquire(tokens)
+                    METRICS.incr("llm_calls")
+                    # Timed inside the semaphore so rate-limit waits are not counted
+                    with METRICS.stage("genai_request"):
+                        response = await openai.ChatCompletion.acreate(
+                            model=MODEL,
+                            messages=messages,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            n=1,
+                            api_key=self.api_key,
+                            api_base=self.api_base,
+                            request_timeout=self.request_timeout,
+                        )
+                _count_tokens(response)
+                return {"content": response.choices[0].message.content.strip(), "error": None, "attempts": attempt}
+            except Exception as e:
+                if attempt > self.max_retries or not _is_retryable(e):
+                    METRICS.incr("llm_errors")
+                    return {"content": None, "error": f"{type(e).__name__}: {e}", "attempts": attempt}
+                delay = _retry_after(e)
+                if delay is None:
+                    # Exponential backoff with full jitter
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                else:
+                    # A server may ask for any delay; never wait longer than max_delay
+                    delay = min(max(delay, 0.0), self.max_delay)
+                METRICS.incr("llm_retries")
+                await asyncio.sleep(delay)
+
+
+def _group_by_key(texts, key_func):
+    """Maps each distinct request key to the rows that share it, in first-seen order."""
+    rows_by_key = {}
+    for row, text in enumerate(texts):
+        rows_by_key.setdefault(key_func(text), []).append(row)
+    return rows_by_key
+
+
+async def analyze_batch_async(texts, api_key, concurrency=8, requests_per_minute=None,
+                              tokens_per_minute=None, max_retries=5, base_delay=1.0, max_delay=60.0,
+                              api_base=None, request_timeout=60, cache=None):
+    """
+    Analyzes many listings concurrently with bounded parallelism and rate limits.
+
+    Identical descriptions (after whitespace normalization) are sent once, and
+    with a cache, previously analyzed descriptions are not sent at all.
+
+    Args:
+        texts (iterable): Job descriptions to analyze.
+        api_key (str): OpenAI API key.
+        concurrency (int): Maximum number of requests in flight.
+        requests_per_minute (float, optional): Request rate limit.
+        tokens_per_minute (float, optional): Estimated token rate limit.
+        max_retries (int): Retries per row on 429/5xx and connection errors.
+        base_delay (float): First backoff delay in seconds, doubled per retry.
+        max_delay (float): Upper bound for a single backoff delay in seconds, including
+            delays the server asks for with Retry-After.
+        api_base (str, optional): Alternative API endpoint, e.g. a local mock server.
+        request_timeout (float): Per-request timeout in seconds.
+        cache (GenAICache, optional): Persistent cache of earlier replies.
+
+    Returns:
+        list: One dict per input row, in input order, with "analysis" (str or
+            None), "error" (str or None), "attempts" (int) and "cached" (bool).
+    """
+    texts = [str(text) for text in texts]
+    if not api_key:
+        return [{"analysis": None, "error": "API key not provided", "attempts": 0, "cached": False} for _ in texts]
+
+    rows_by_key = _group_by_key(texts, request_cache_key)
+    results = [None] * len(texts)
+    pending = []
+    for key, rows in rows_by_key.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            pending.append(key)
+        else:
+            for row in rows:
+                results[row] = {"analysis": cached, "error": None, "attempts": 0, "cached": True}
+    if cache is not None:
+        METRICS.incr("genai_cache_hits", len(rows_by_key) - len(pending))
+        METRICS.incr("genai_cache_misses", len(pending))
+
+    runner = _RequestRunner(api_key, concurrency, requests_per_minute, tokens_per_minute,
+                            max_retries, base_delay, max_delay, api_base, request_timeout)
+    fresh = await asyncio.gather(*(
+        runner.complete(build_messages(texts[rows_by_key[key][0]])) for key in pending
+    ))
+
+    for key, reply in zip(pending, fresh):
+        result = {"analysis": reply["content"], "error": reply["error"], "attempts": reply["attempts"], "cached": False}
+        for row in rows_by_key[key]:
+            results[row] = dict(result)
+    if cache is not None:
+        cache.set_many((key, reply["content"]) for key, reply in zip(pending, fresh) if reply["error"] is None)
+    return results
+
+
+def analyze_batch(texts, api_key, **kwargs):
+    """
+    Synchronous wrapper around `analyze_batch_async` for scripts and Streamlit.
+
+    Accepts the same arguments and returns the same list of per-row results.
+    """
+    return asyncio.run(analyze_batch_async(texts, api_key, **kwargs))
+
+
+def structured_cache_key(text):
+    """Cache key for a structured (JSON) verdict on `text`."""
+    return cache_key(text, MODEL, STRUCTURED_PROMPT, STRUCTURED_TEMPERATURE, format=STRUCTURED_FORMAT)
+
+
+def build_structured_messages(items):
+    """
+    Builds one request that asks for verdicts on several listings.
+
+    Args:
+        items (list): (id, text) pairs; ids are echoed back in the reply.
+
+    Returns:
+        list: Chat messages.
+    """
+    listings = [{"id": item_id, "text": text} for item_id, text in items]
+    return [
+        {"role": "system", "content": STRUCTURED_PROMPT},
+        {"role": "user", "content": json.dumps(listings, ensure_ascii=False)}
+    ]
+
+
+def pack_batches(items, batch_size=10, token_budget=4000):
+    """
+    Groups listings into requests of at most `batch_size` listings and roughly
+    `token_budget` tokens (prompt plus expected reply). A listing that is over
+    budget on its own is sent alone.
+
+    Args:
+        items (list): (id, text) pairs.
+        batch_size (int): Maximum listings per request.
+        token_budget (int): Approximate token limit per request.
+
+    Returns:
+        list: Lists of (id, text) pairs.
+    """
+    overhead = len(STRUCTURED_PROMPT) // 4 + 16
+    batches, batch, used = [], [], overhead
+    for item_id, text in items:
+        cost = len(text) // 4 + 16 + STRUCTURED_TOKENS_PER_LISTING
+        if batch and (len(batch) >= batch_size or used + cost > token_budget):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append((item_id, text))
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_structured_response(content, ids):
+    """
+    Validates a structured reply and splits it back into per-listing records.
+
+    Args:
+        content (str): Model reply, expected to be a JSON array (optionally in a
+            Markdown code fence).
+        ids (list): Ids that were sent in the request.
+
+    Returns:
+        dict: id -> {"verdict", "score", "indicators"}.
+
+    Raises:
+        ValueError: If the reply is not valid JSON of the expected shape or does
+            not cover every id exactly once. Ids may come back as strings.
+    """
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("["):] if "[" in text else text
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Reply is not valid JSON: {e}") from e
+    if not isinstance(data, list):
+        raise ValueError("Reply is not a JSON array")
+
+    # Models sometimes quote numeric ids; anything but an int or string is rejected
+    expected = {str(item_id): item_id for item_id in ids}
+    records = {}
+    for entry in data:
+        raw_id = entry.get("id") if isinstance(entry, dict) else None
+        if isinstance(raw_id, bool) or not isinstance(raw_id, (int, str)):
+            raise ValueError(f"Unexpected entry in reply: {entry!r}")
+        item_id = expected.get(str(raw_id).strip())
+        if item_id is None or item_id in records:
+            raise ValueError(f"Unexpected entry in reply: {entry!r}")
+        entry = dict(entry, id=item_id)
+        verdict = str(entry.get("verdict", "")).lower()
+        if verdict not in VERDICTS:
+            raise ValueError(f"Unknown verdict {entry.get('verdict')!r} for id {entry['id']}")
+        score = entry.get("score")
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+            raise ValueError(f"Invalid score {score!r} for id {entry['id']}")
+        indicators = entry.get("indicators", [])
+        if not isinstance(indicators, list):
+            raise ValueError(f"Indicators for id {entry['id']} are not a list")
+        records[entry["id"]] = {
+            "verdict": verdict,
+            "score": int(round(score)),
+            "indicators": [str(indicator) for indicator in indicators],
+        }
+    missing = set(expected.values()) - set(records)
+    if missing:
+        raise ValueError(f"Reply is missing ids {sorted(missing)}")
+    return records
+
+
+async def _analyze_structured_batch(runner, batch):
+    """Analyzes one packed batch, falling back to one listing per request on bad replies."""
+    max_tokens = STRUCTURED_TOKENS_PER_LISTING * len(batch) + 20
+    reply = await runner.complete(build_structured_messages(batch), STRUCTURED_TEMPERATURE, max_tokens)
+    if reply["error"] is not None:
+        return {item_id: {"error": reply["error"], "attempts": reply["attempts"]} for item_id, _ in batch}
+    try:
+        records = parse_structured_response(reply["content"], [item_id for item_id, _ in batch])
+    except ValueError as e:
+        if len(batch) == 1:
+            return {batch[0][0]: {"error": f"Malformed GenAI response: {e}", "attempts": reply["attempts"]}}
+        singles = await asyncio.gather(*(_analyze_structured_batch(runner, [item]) for item in batch))
+        merged = {}
+        for single in singles:
+            for record in single.values():
+                record["attempts"] += reply["attempts"]
+            merged.update(single)
+        return merged
+    for record in records.values():
+        record["error"] = None
+        record["attempts"] = reply["attempts"]
+    return records
+
+
+async def analyze_structured_async(texts, api_key, batch_size=10, token_budget=4000, cache=None, **limits):
+    """
+    Gets machine-readable verdicts for many listings, several listings per request.
+
+    Listings are packed into requests by `pack_batches` and the model is asked
+    for a JSON array of {id, verdict, score, indicators}. A batch whose reply
+    fails validation is retried one listing at a time.
+
+    Args:
+        texts (iterable): Job descriptions to analyze.
+        api_key (str): OpenAI API key.
+        batch_size (int): Maximum listings per request.
+        token_budget (int): Approximate token limit per request.
+        cache (GenAICache, optional): Persistent cache of earlier verdicts.
+        **limits: Concurrency, rate-limit and retry settings, as for
+            `analyze_batch_async`.
+
+    Returns:
+        list: One dict per input row, in input order, with "verdict" (str or
+            None), "score" (int or None), "indicators" (list), "error" (str or
+            None), "attempts" (int) and "cached" (bool).
+    """
+    texts = [str(text) for text in texts]
+    empty = {"verdict": None, "score": None, "indicators": [], "attempts": 0, "cached": False}
+    if not api_key:
+        return [dict(empty, error="API key not provided") for _ in texts]
+
+    rows_by_key = _group_by_key(texts, structured_cache_key)
+    results = [None] * len(texts)
+    pending = []
+    for key, rows in rows_by_key.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            pending.append(key)
+        else:
+            for row in rows:
+                results[row] = dict(json.loads(cached), error=None, attempts=0, cached=True)
+    if cache is not None:
+        METRICS.incr("genai_cache_hits", len(rows_by_key) - len(pending))
+        METRICS.incr("genai_cache_misses", len(pending))
+
+    runner = _RequestRunner(api_key, **limits)
+    items = [(item_id, texts[rows_by_key[key][0]]) for item_id, key in enumerate(pending)]
+    records = {}
+    for batch_records in await asyncio.gather(*(
+        _analyze_structured_batch(runner, batch) for batch in pack_batches(items, batch_size, token_budget)
+    )):
+        records.update(batch_records)
+
+    to_cache = []
+    for item_id, key in enumerate(pending):
+        record = dict(empty)
+        record.update(records[item_id])
+        if record["error"] is None:
+            to_cache.append((key, json.dumps(
+                {"verdict": record["verdict"], "score": record["score"], "indicators": record["indicators"]}
+            )))
+        for row in rows_by_key[key]:
+            results[row] = dict(record)
+    if cache is not None:
+        cache.set_many(to_cache)
+    return results
+
+
+def analyze_structured(texts, api_key, **kwargs):
+    """
+    Synchronous wrapper around `analyze_structured_async`.
+
+    Accepts the same arguments and returns the same list of per-row results.
+    """
+    return asyncio.run(analyze_structured_async(texts, api_key, **kwargs))
+
+
 if __name__ == '__main__':
     print("Running genai_analysis.py directly (for testing):")
     test_text = "This amazing opportunity guarantees you a high-paying role immediately after you pay a small training fee. No experience needed!"
-    
+
     # For direct testing, you'd still need to provide an API key
     test_api_key = os.environ.get("OPENAI_API_KEY")
     if test_api_key:
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "GENAI_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "genai_cache.sqlite"),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """
+    Normalizes a description so trivially different copies share a cache entry.
+
+    Args:
+        text (str): Raw description text.
+
+    Returns:
+        str: NFC-normalized text with whitespace runs collapsed and ends stripped.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", str(text))).strip()
+
+
+def cache_key(text, model, prompt, temperature, **params):
+    """
+    Builds the content-addressed key for one GenAI request.
+
+    Args:
+        text (str): The description being analyzed.
+        model (str): Model name.
+        prompt (str): Prompt text (system prompt and any template).
+        temperature (float): Sampling temperature.
+        **params: Any other request settings that change the reply.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    payload = json.dumps(
+        {"text": normalize_text(text), "model": model, "prompt": prompt,
+         "temperature": temperature, "params": params},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenAICache:
+    """
+    On-disk SQLite cache for GenAI replies with LRU eviction and optional TTL.
+
+    Safe to share between threads, and between processes through SQLite's own
+    locking.
+
+    Args:
+        path (str): SQLite database file; parent directories are created.
+        max_entries (int): Entries kept before the least recently used are evicted.
+        ttl (float, optional): Seconds an entry stays valid; None keeps it forever.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=100_000, ttl=None):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS genai_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS genai_cache_accessed ON genai_cache (accessed)")
+
+    def get(self, key):
+        """
+        Looks up a cached reply and marks it as recently used.
+
+        Args:
+            key (str): Key from `cache_key`.
+
+        Returns:
+            str or None: The cached reply, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM genai_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM genai_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE genai_cache SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        """
+        Stores a reply, evicting least recently used entries beyond `max_entries`.
+
+        Args:
+            key (str): Key from `cache_key`.
+            value (str): The reply to cache.
+        """
+        self.set_many([(key, value)])
+
+    def set_many(self, items):
+        """
+        Stores several replies in one transaction.
+
+        Args:
+            items (iterable): (key, value) pairs.
+        """
+        now = time.time()
+        rows = [(key, value, now, now) for key, value in items]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO genai_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM genai_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM genai_cache WHERE key IN "
+                    "(SELECT key FROM genai_cache ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+
+    def stats(self):
+        """
+        Returns cache counters for this process.
+
+        Returns:
+            dict: hits, misses, hit_rate and the number of stored entries.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM genai_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._conn.close()
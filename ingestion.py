@@ -0,0 +1,187 @@
+import time
+
+import pandas as pd
+
+from instrumentation import METRICS
+from risk_scoring import score_batch
+from rule_engine import get_ruleset
+
+# Columns the dashboard actually uses; everything else is skipped when present
+NEEDED_COLUMNS = ("Job Title", "Companies", "Description")
+DESCRIPTION_COLUMN = "Description"
+CHUNK_ROWS = 50_000
+
+
+def _string_dtype():
+    """Arrow-backed strings when pyarrow is installed, pandas strings otherwise."""
+    try:
+        pd.Series([], dtype="string[pyarrow]")
+        return "string[pyarrow]"
+    except (ImportError, TypeError):
+        return "string"
+
+
+def _select_columns(header, columns):
+    """Keeps the needed columns, or every column if there is no description column."""
+    if DESCRIPTION_COLUMN not in header:
+        return list(header)
+    return [col for col in header if col in columns]
+
+
+def compact_frame(df):
+    """
+    Converts text columns to compact string dtypes.
+
+    Args:
+        df (pd.DataFrame): A freshly read chunk.
+
+    Returns:
+        pd.DataFrame: The same data with object columns stored as strings.
+    """
+    string_dtype = _string_dtype()
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(string_dtype)
+    return df
+
+
+def _file_size(uploaded_file):
+    """Returns the upload's size in bytes, or None if it cannot be determined."""
+    size = getattr(uploaded_file, "size", None)
+    if size is None and hasattr(uploaded_file, "seek"):
+        position = uploaded_file.tell()
+        size = uploaded_file.seek(0, 2)
+        uploaded_file.seek(position)
+    return size
+
+
+def iter_csv_chunks(uploaded_file, columns=NEEDED_COLUMNS, chunksize=CHUNK_ROWS):
+    """
+    Reads a CSV in chunks, keeping only the needed columns.
+
+    Args:
+        uploaded_file: Path or binary file-like object.
+        columns (tuple): Columns to keep when a description column exists.
+        chunksize (int): Rows per chunk.
+
+    Yields:
+        tuple: (chunk DataFrame, fraction of the file read so far or None).
+    """
+    size = _file_size(uploaded_file) if hasattr(uploaded_file, "read") else None
+    header = pd.read_csv(uploaded_file, nrows=0, skipinitialspace=True).columns
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+    usecols = _select_columns(header, columns)
+    reader = pd.read_csv(
+        uploaded_file, skipinitialspace=True, usecols=usecols, dtype=str, chunksize=chunksize
+    )
+    with reader:
+        for chunk in reader:
+            fraction = uploaded_file.tell() / size if size else None
+            yield chunk, fraction
+
+
+def iter_excel_chunks(uploaded_file, columns=NEEDED_COLUMNS, chunksize=CHUNK_ROWS):
+    """
+    Reads the first worksheet of an .xlsx file with openpyxl's read-only iterator.
+
+    Args:
+        uploaded_file: Path or binary file-like object.
+        columns (tuple): Columns to keep when a description column exists.
+        chunksize (int): Rows per chunk.
+
+    Yields:
+        tuple: (chunk DataFrame, fraction of the sheet read so far or None).
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total = sheet.max_row
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+        keep = _select_columns(header, columns)
+        positions = [header.index(col) for col in keep]
+
+        buffer, done = [], 1
+        for row in rows:
+            buffer.append([row[i] if i < len(row) else None for i in positions])
+            if len(buffer) >= chunksize:
+                done += len(buffer)
+                yield pd.DataFrame(buffer, columns=keep, dtype=object), done / total if total else None
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=keep, dtype=object), 1.0
+    finally:
+        workbook.close()
+
+
+def iter_chunks(uploaded_file, name, columns=NEEDED_COLUMNS, chunksize=CHUNK_ROWS):
+    """
+    Reads a CSV or Excel upload chunk by chunk.
+
+    Legacy .xls files have no streaming reader and are read in one go.
+
+    Args:
+        uploaded_file: Path or binary file-like object.
+        name (str): File name, used to pick the reader.
+        columns (tuple): Columns to keep when a description column exists.
+        chunksize (int): Rows per chunk.
+
+    Yields:
+        tuple: (chunk DataFrame, fraction read so far or None).
+    """
+    if name.endswith(".csv"):
+        yield from iter_csv_chunks(uploaded_file, columns, chunksize)
+    elif name.endswith(".xlsx"):
+        yield from iter_excel_chunks(uploaded_file, columns, chunksize)
+    elif name.endswith(".xls"):
+        df = pd.read_excel(uploaded_file)
+        yield df[_select_columns(df.columns, columns)], 1.0
+    else:
+        raise ValueError("Unsupported file type. Please upload a CSV or Excel file.")
+
+
+def load_streaming(uploaded_file, name, columns=NEEDED_COLUMNS, chunksize=CHUNK_ROWS, score=True, progress=None,
+                   profile=False):
+    """
+    Loads a large upload chunk by chunk with compact dtypes, scoring as it goes.
+
+    Args:
+        uploaded_file: Path or binary file-like object.
+        name (str): File name, used to pick the reader.
+        columns (tuple): Columns to keep when a description column exists.
+        chunksize (int): Rows per chunk.
+        score (bool): Add "Risk Score" for the description column of each chunk.
+        progress (callable, optional): Called as progress(rows_loaded, fraction)
+            after every chunk; fraction may be None.
+        profile (bool): Record per-rule timing while scoring (see `score_batch`).
+
+    Returns:
+        pd.DataFrame: The loaded rows. When scored, `df.attrs` records the
+            scored column and ruleset digest so callers can skip rescoring.
+    """
+    started = time.perf_counter()
+    ruleset = get_ruleset() if score else None
+    chunks = []
+    rows = 0
+    for chunk, fraction in iter_chunks(uploaded_file, name, columns, chunksize):
+        chunk = compact_frame(chunk)
+        if ruleset is not None and DESCRIPTION_COLUMN in chunk.columns:
+            chunk["Risk Score"], _ = score_batch(chunk[DESCRIPTION_COLUMN], ruleset, profile)
+        chunks.append(chunk)
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows, fraction)
+
+    if not chunks:
+        return pd.DataFrame()
+    df = pd.concat(chunks, ignore_index=True)
+    METRICS.record("load_streaming", time.perf_counter() - started, rows)
+    if "Companies" in df.columns:
+        df["Companies"] = df["Companies"].astype("category")
+    if ruleset is not None and "Risk Score" in df.columns:
+        df.attrs["scored_column"] = DESCRIPTION_COLUMN
+        df.attrs["ruleset_digest"] = ruleset.digest
+    return df
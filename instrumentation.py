@@ -0,0 +1,163 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+PROMETHEUS_PREFIX = "scamternship"
+
+_METRIC_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class Metrics:
+    """
+    Process-wide stage timers and counters for the hot paths.
+
+    Stages are timed with `stage()`, which also counts calls and, optionally,
+    rows processed; counters such as LLM calls, cache hits and tokens are
+    bumped with `incr()`. Per-rule match timing is requested per call, as it
+    adds a clock read around every rule: pass `record_rule` as the timer of
+    `RuleSet.match`, or `profile=True` to `risk_scoring.score_batch`.
+    Safe to use from several threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._rules = {}
+        self.started = time.time()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Times a block of work.
+
+        Args:
+            name (str): Stage name, e.g. "score_batch".
+            rows (int, optional): Rows the block processes.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, rows)
+
+    def record(self, name, seconds, rows=None):
+        """Adds one timed call of a stage."""
+        with self._lock:
+            stage = self._stages.setdefault(name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "rows": 0})
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+            stage["max_seconds"] = max(stage["max_seconds"], seconds)
+            if rows is not None:
+                stage["rows"] += rows
+
+    def incr(self, name, value=1):
+        """Adds `value` to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def record_rule(self, rule, seconds, calls=1, fired=0):
+        """
+        Adds match attempts of a rule; pass as the `timer` of `RuleSet.match`.
+
+        Args:
+            rule (str): Rule label.
+            seconds (float): Time spent matching.
+            calls (int): Texts the rule's patterns ran on.
+            fired (int): How many of them matched.
+        """
+        with self._lock:
+            entry = self._rules.setdefault(rule, {"calls": 0, "seconds": 0.0, "fired": 0})
+            entry["calls"] += calls
+            entry["seconds"] += seconds
+            entry["fired"] += fired
+
+    def reset(self):
+        """Clears every timer and counter."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._rules.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """
+        Returns a copy of the current measurements.
+
+        Returns:
+            dict: "stages" (name -> calls, seconds, max_seconds, rows,
+                rows_per_sec), "counters" (name -> value), "rules" (label ->
+                calls, seconds, fired, us_per_call, slowest first) and "since".
+        """
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self._stages.items()}
+            counters = dict(self._counters)
+            rules = {name: dict(rule) for name, rule in self._rules.items()}
+            since = self.started
+        for stage in stages.values():
+            stage["rows_per_sec"] = stage["rows"] / stage["seconds"] if stage["rows"] and stage["seconds"] else None
+        for rule in rules.values():
+            rule["us_per_call"] = rule["seconds"] / rule["calls"] * 1e6 if rule["calls"] else 0.0
+        rules = dict(sorted(rules.items(), key=lambda item: item[1]["seconds"], reverse=True))
+        return {"since": since, "stages": stages, "counters": counters, "rules": rules}
+
+    def to_json(self):
+        """Returns the snapshot as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX, extra=()):
+        """
+        Returns the snapshot in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix for every metric name.
+            extra (iterable): More families as (name, kind, help_text, samples)
+                tuples, where samples are (labels dict, value) pairs; for
+                figures the caller keeps itself.
+
+        Returns:
+            str: Metrics text, one sample per line.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            if not samples:
+                return
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+        stages = snapshot["stages"].items()
+        family("stage_seconds_total", "counter", "Time spent in each stage.",
+               [({"stage": name}, stage["seconds"]) for name, stage in stages])
+        family("stage_calls_total", "counter", "Calls of each stage.",
+               [({"stage": name}, stage["calls"]) for name, stage in stages])
+        family("stage_max_seconds", "gauge", "Slowest single call of each stage.",
+               [({"stage": name}, stage["max_seconds"]) for name, stage in stages])
+        family("stage_rows_total", "counter", "Rows processed by each stage.",
+               [({"stage": name}, stage["rows"]) for name, stage in stages if stage["rows"]])
+        for name, value in snapshot["counters"].items():
+            family(f"{_METRIC_NAME.sub('_', name)}_total", "counter", f"Counter {name}.", [({}, value)])
+        rules = snapshot["rules"].items()
+        family("rule_seconds_total", "counter", "Time spent matching each rule.",
+               [({"rule": name}, rule["seconds"]) for name, rule in rules])
+        family("rule_calls_total", "counter", "Match attempts of each rule.",
+               [({"rule": name}, rule["calls"]) for name, rule in rules])
+        family("rule_fired_total", "counter", "Times each rule matched.",
+               [({"rule": name}, rule["fired"]) for name, rule in rules])
+        for name, kind, help_text, samples in extra:
+            family(name, kind, help_text, samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Shared by every module; the dashboard shows and exports it
+METRICS = Metrics()
@@ -0,0 +1,295 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from analysis_cache import RISK_BINS, RISK_LABELS
+from risk_scoring import score_batch
+from rule_engine import get_ruleset
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "LISTING_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "listings.sqlite"),
+)
+
+# DataFrame column -> store column for GenAI results
+GENAI_COLUMNS = {
+    "GenAI Verdict": "genai_verdict",
+    "GenAI Score": "genai_score",
+    "GenAI Indicators": "genai_indicators",
+    "GenAI Analysis": "genai_analysis",
+}
+
+
+def listing_key(title, company, description):
+    """
+    Builds the content-addressed key identifying a listing across uploads.
+
+    Fields are compared with whitespace runs collapsed, so re-exported copies
+    of the same listing share a key.
+
+    Args:
+        title (str): Job title, or "" if unknown.
+        company (str): Company name, or "" if unknown.
+        description (str): Job description.
+
+    Returns:
+        int: Signed 64-bit BLAKE2b digest of the normalized fields.
+    """
+    payload = "\x1f".join(" ".join(value.split()) for value in (title, company, description))
+    return int.from_bytes(hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def _column_or_blank(df, column):
+    if column in df.columns:
+        return df[column].astype(str).fillna("").tolist()
+    return [""] * len(df)
+
+
+def listing_keys(df, description_column):
+    """
+    Computes `listing_key` for every row of an upload.
+
+    Args:
+        df (pd.DataFrame): Listings.
+        description_column (str): Column with the job descriptions.
+
+    Returns:
+        pd.Series: Keys aligned with `df`.
+    """
+    titles = _column_or_blank(df, "Job Title")
+    companies = _column_or_blank(df, "Companies")
+    descriptions = _column_or_blank(df, description_column)
+    return pd.Series(
+        [listing_key(*fields) for fields in zip(titles, companies, descriptions)],
+        index=df.index, name="Listing Key",
+    )
+
+
+class ListingStore:
+    """
+    Persistent SQLite store of scored listings, keyed by listing hash.
+
+    Uploads are merged incrementally: listings already stored under the current
+    ruleset version keep their scores, flags and GenAI results, and only unseen
+    listings are scored. Safe to share between threads.
+
+    Args:
+        path (str): SQLite database file; parent directories are created.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS listings ("
+                "key INTEGER PRIMARY KEY, job_title TEXT, company TEXT, description TEXT, "
+                "risk_score INTEGER NOT NULL, risk_level TEXT NOT NULL, flags TEXT, ruleset_version TEXT, "
+                "ruleset_digest TEXT, genai_verdict TEXT, genai_score REAL, genai_indicators TEXT, genai_analysis TEXT, "
+                "first_seen REAL NOT NULL, last_seen REAL NOT NULL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(listings)")}
+            if "ruleset_digest" not in columns:
+                # Stores created before rules were tracked by digest; their rows get rescored
+                self._conn.execute("ALTER TABLE listings ADD COLUMN ruleset_digest TEXT")
+            for column in ("risk_score", "risk_level", "company"):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS listings_{column} ON listings ({column})")
+
+    def _lookup(self, keys, now):
+        """
+        Returns stored rows for the given keys, indexed by key, and marks them
+        as seen at `now`. Call with the lock held.
+        """
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_keys (key INTEGER PRIMARY KEY)")
+        self._conn.execute("DELETE FROM lookup_keys")
+        self._conn.executemany("INSERT OR IGNORE INTO lookup_keys (key) VALUES (?)", ((key,) for key in keys))
+        stored = pd.read_sql_query(
+            "SELECT key, risk_score, risk_level, flags, ruleset_version, ruleset_digest, first_seen, "
+            f"{', '.join(GENAI_COLUMNS.values())} FROM listings JOIN lookup_keys USING (key)",
+            self._conn,
+        )
+        # Not index_col: pandas mis-builds an index of two keys whose difference overflows int64
+        stored.index = pd.Index(stored.pop("key").to_numpy())
+        self._conn.execute("UPDATE listings SET last_seen = ? WHERE key IN (SELECT key FROM lookup_keys)", (now,))
+        return stored
+
+    def merge(self, df, description_column, ruleset=None, profile=False):
+        """
+        Adds an upload to the store, scoring only listings it has not seen.
+
+        Listings scored with different rules (by `RuleSet.digest`) are scored
+        again; their GenAI results are kept.
+
+        Args:
+            df (pd.DataFrame): Listings.
+            description_column (str): Column with the job descriptions.
+            ruleset (RuleSet, optional): Rules to score with; defaults to the current file.
+            profile (bool): Record per-rule timing while scoring (see `score_batch`).
+
+        Returns:
+            tuple: (results, summary) where `results` is a DataFrame aligned
+                with `df` with "Listing Key", "Risk Score", "Risk Level",
+                "Risk Flags", "First Seen" and any stored GenAI columns, and
+                `summary` is a dict with rows, new, rescored and reused counts.
+        """
+        if ruleset is None:
+            ruleset = get_ruleset()
+        now = time.time()
+        keys = listing_keys(df, description_column)
+        unique_keys = pd.unique(keys.to_numpy())
+        with self._lock, self._conn:
+            stored = self._lookup(unique_keys.tolist(), now)
+
+        current = stored.index[stored["ruleset_digest"] == ruleset.digest]
+        to_score = pd.Index(unique_keys).difference(current, sort=False)
+        new = len(to_score.difference(stored.index, sort=False))
+
+        fresh = pd.DataFrame(index=to_score)
+        if len(to_score):
+            # One row per key to score, taken from its first occurrence in the upload
+            positions = pd.Series(np.arange(len(df)), index=keys.to_numpy()).groupby(level=0).first()[to_score]
+            sample = df.iloc[positions.to_numpy()]
+            texts = sample[description_column]
+            scores, flags = score_batch(texts, ruleset, profile)
+            flag_names = np.array(flags.columns, dtype=object)
+            # Rescored listings keep their first_seen and GenAI results
+            fresh = stored.reindex(to_score).assign(
+                risk_score=scores.to_numpy(),
+                risk_level=pd.cut(scores, bins=RISK_BINS, labels=RISK_LABELS, right=False).astype(str).to_numpy(),
+                flags=["; ".join(flag_names[row]) for row in flags.to_numpy(dtype=bool)],
+                ruleset_version=ruleset.version,
+                ruleset_digest=ruleset.digest,
+            )
+            fresh["first_seen"] = fresh["first_seen"].fillna(now)
+            rows = zip(
+                to_score.tolist(), _column_or_blank(sample, "Job Title"), _column_or_blank(sample, "Companies"),
+                texts.astype(str).fillna(""), scores.tolist(), fresh["risk_level"], fresh["flags"],
+                fresh["ruleset_version"], fresh["ruleset_digest"], fresh["first_seen"], [now] * len(to_score),
+            )
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO listings (key, job_title, company, description, risk_score, risk_level, flags, "
+                    "ruleset_version, ruleset_digest, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET risk_score = excluded.risk_score, "
+                    "risk_level = excluded.risk_level, flags = excluded.flags, "
+                    "ruleset_version = excluded.ruleset_version, ruleset_digest = excluded.ruleset_digest, "
+                    "last_seen = excluded.last_seen",
+                    rows,
+                )
+
+        merged = pd.concat([stored.loc[current], fresh]).reindex(keys.to_numpy())
+        results = pd.DataFrame({
+            "Listing Key": keys,
+            "Risk Score": merged["risk_score"].astype(int).to_numpy(),
+            "Risk Level": pd.Categorical(merged["risk_level"].to_numpy(), categories=RISK_LABELS),
+            "Risk Flags": merged["flags"].to_numpy(),
+            "First Seen": pd.to_datetime(merged["first_seen"].to_numpy(), unit="s"),
+        }, index=df.index)
+        for column, field in GENAI_COLUMNS.items():
+            if merged[field].notna().any():
+                results[column] = merged[field].to_numpy()
+
+        summary = {"rows": len(df), "new": new, "rescored": len(to_score) - new, "reused": len(unique_keys) - len(to_score)}
+        return results, summary
+
+    def update_genai(self, keys, results):
+        """
+        Saves GenAI results for stored listings.
+
+        Only non-empty values are written, so a structured run does not erase
+        an earlier free-text analysis and vice versa.
+
+        Args:
+            keys (pd.Series): Listing keys, in the same row order as `results`.
+            results (pd.DataFrame): GenAI columns as produced by `triage_analyze`.
+        """
+        columns = [column for column in GENAI_COLUMNS if column in results.columns]
+        if not columns:
+            return
+        if "GenAI Error" in results.columns:
+            ok = results["GenAI Error"].isna().to_numpy()
+        else:
+            ok = np.ones(len(results), dtype=bool)
+        assignments = ", ".join(f"{GENAI_COLUMNS[column]} = COALESCE(?, {GENAI_COLUMNS[column]})" for column in columns)
+        frame = results[columns][ok].astype(object)
+        frame = frame.where(frame.notna(), None)
+        rows = [(*values, int(key)) for key, values in zip(keys.to_numpy()[ok], frame.itertuples(index=False, name=None))
+                if any(value is not None for value in values)]
+        with self._lock, self._conn:
+            self._conn.executemany(f"UPDATE listings SET {assignments} WHERE key = ?", rows)
+
+    def query(self, min_score=None, levels=None, companies=None, since=None, limit=None):
+        """
+        Reads stored listings matching the filters, highest risk first.
+
+        Every filter is served by an index on the listings table.
+
+        Args:
+            min_score (int, optional): Lowest risk score to include.
+            levels (list, optional): Risk levels to include.
+            companies (list, optional): Companies to include.
+            since (float, optional): Only listings seen at or after this Unix time.
+            limit (int, optional): Most rows to return.
+
+        Returns:
+            pd.DataFrame: Listing Key, Job Title, Companies, Description, Risk
+                Score, Risk Level, Risk Flags, Ruleset Version, Ruleset Digest, GenAI columns,
+                First Seen and Last Seen.
+        """
+        where, params = [], []
+        if min_score is not None:
+            where.append("risk_score >= ?")
+            params.append(min_score)
+        if levels is not None:
+            where.append(f"risk_level IN ({', '.join('?' * len(levels))})" if levels else "0")
+            params.extend(levels)
+        if companies is not None:
+            where.append(f"company IN ({', '.join('?' * len(companies))})" if companies else "0")
+            params.extend(companies)
+        if since is not None:
+            where.append("last_seen >= ?")
+            params.append(since)
+        sql = (
+            "SELECT key AS \"Listing Key\", job_title AS \"Job Title\", company AS \"Companies\", description AS \"Description\", "
+            "risk_score AS \"Risk Score\", risk_level AS \"Risk Level\", flags AS \"Risk Flags\", "
+            "ruleset_version AS \"Ruleset Version\", ruleset_digest AS \"Ruleset Digest\", "
+            + "".join(f"{field} AS \"{column}\", " for column, field in GENAI_COLUMNS.items())
+            + "first_seen AS \"First Seen\", last_seen AS \"Last Seen\" FROM listings"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY risk_score DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        df["First Seen"] = pd.to_datetime(df["First Seen"], unit="s")
+        df["Last Seen"] = pd.to_datetime(df["Last Seen"], unit="s")
+        return df.drop(columns=[column for column in GENAI_COLUMNS if df[column].isna().all()])
+
+    def companies(self):
+        """Returns the distinct stored company names, sorted."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT company FROM listings WHERE company != '' ORDER BY company"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self):
+        """Returns the number of stored listings."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._conn.close()
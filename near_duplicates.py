@@ -0,0 +1,158 @@
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+SHINGLE_SIZE = 2  # Words per shingle
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 similarity usually share a bucket
+THRESHOLD = 0.7
+
+_SHIFT32 = np.uint64(32)
+
+
+def _shingle_hashes(tokens, shingle_size):
+    """
+    Hashes the word shingles of each tokenized text.
+
+    Returns:
+        tuple: (hashes, starts) where `hashes` is a uint64 array of shingle
+            hashes grouped by text and `starts` gives each text's first
+            position in it. Every text has at least one shingle; texts shorter
+            than `shingle_size` words are one shingle, empty texts hash to 0.
+    """
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    codes, _ = pd.factorize(np.array(list(chain.from_iterable(tokens)), dtype=object))
+    codes = codes.astype(np.uint64) + np.uint64(1)
+
+    counts = np.maximum(lengths - shingle_size + 1, 1)
+    starts = np.zeros(len(tokens), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    token_starts = np.zeros(len(tokens), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=token_starts[1:])
+
+    # Position of each shingle's first token in `codes`
+    first = np.repeat(token_starts - starts, counts) + np.arange(counts.sum())
+    width = np.repeat(np.minimum(lengths, shingle_size), counts)
+    hashes = np.zeros(len(first), dtype=np.uint64)
+    for offset in range(shingle_size):
+        inside = offset < width
+        hashes[inside] = hashes[inside] * np.uint64(0x100000001B3) + codes[first[inside] + offset]
+    return hashes, starts
+
+
+class NearDuplicateClusters:
+    """
+    Groups texts that are near-duplicates of each other.
+
+    Texts are split into word shingles, summarized with MinHash signatures and
+    bucketed with locality-sensitive hashing, so only texts sharing a bucket
+    are compared. Each cluster is represented by its first row; a row only
+    joins a cluster when its estimated Jaccard similarity to that row reaches
+    the threshold.
+
+    Args:
+        labels (np.ndarray): Position of each row's cluster representative.
+    """
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.representatives, self.inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+        self.sizes = counts[self.inverse]
+
+    @classmethod
+    def build(cls, texts, threshold=THRESHOLD, shingle_size=SHINGLE_SIZE, num_perm=NUM_PERM, bands=BANDS, seed=1):
+        """
+        Clusters a text column.
+
+        Args:
+            texts (pd.Series): Descriptions to cluster.
+            threshold (float): Minimum estimated Jaccard similarity to a cluster's representative.
+            shingle_size (int): Words per shingle.
+            num_perm (int): MinHash signature length; must be divisible by `bands`.
+            bands (int): LSH bands; more bands catch less similar pairs.
+            seed (int): Seed for the hash functions.
+
+        Returns:
+            NearDuplicateClusters: Clusters; row ids are positions in `texts`.
+        """
+        # Exact duplicates (after lowercasing and collapsing whitespace) are grouped up front
+        tokens = [text.lower().split() for text in texts.astype(str).fillna("")]
+        codes, uniques = pd.factorize(np.array([" ".join(words) for words in tokens], dtype=object))
+        if len(uniques) < 2:
+            return cls(np.zeros(len(texts), dtype=np.int64))
+        first_row = np.full(len(uniques), len(texts), dtype=np.int64)
+        np.minimum.at(first_row, codes, np.arange(len(texts)))
+
+        hashes, starts = _shingle_hashes([tokens[row] for row in first_row], shingle_size)
+        rng = np.random.default_rng(seed)
+        multipliers = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        offsets = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        signatures = np.empty((len(uniques), num_perm), dtype=np.uint32)
+        with np.errstate(over="ignore"):
+            for i in range(num_perm):
+                values = ((hashes ^ offsets[i]) * multipliers[i]) >> _SHIFT32
+                signatures[:, i] = np.minimum.reduceat(values, starts)
+
+        # Rows sharing a bucket in any band are linked, then merged into components
+        rows = num_perm // bands
+        weights = rng.integers(1, 2**63, size=rows, dtype=np.uint64) | np.uint64(1)
+        buckets = []
+        with np.errstate(over="ignore"):
+            for band in range(bands):
+                block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+                keys = (block * weights).sum(axis=1) ^ (block[:, 0] << _SHIFT32)
+                buckets.append(pd.factorize(keys)[0])
+        labels = np.arange(len(uniques))
+        while True:
+            previous = labels
+            for bucket in buckets:
+                labels = np.minimum(labels, pd.Series(labels).groupby(bucket).transform("min").to_numpy())
+            labels = labels[labels]
+            if np.array_equal(labels, previous):
+                break
+
+        # Candidate pairs can be false positives; keep members close to their representative
+        similarity = (signatures == signatures[labels]).mean(axis=1)
+        labels = np.where(similarity >= threshold, labels, np.arange(len(uniques)))
+
+        # Map back to rows, using each cluster's first row as its representative
+        rep_of_unique = np.full(len(uniques), len(texts), dtype=np.int64)
+        np.minimum.at(rep_of_unique, labels, first_row)
+        return cls(rep_of_unique[labels][codes])
+
+    @property
+    def n_clusters(self):
+        return len(self.representatives)
+
+    @property
+    def duplicate_rows(self):
+        """Number of rows that are not their cluster's representative."""
+        return len(self.labels) - len(self.representatives)
+
+    def summary(self, df=None, scores=None, min_size=2):
+        """
+        Lists the clusters with at least `min_size` rows, largest first.
+
+        Args:
+            df (pd.DataFrame, optional): Listings, for the company count and a sample title.
+            scores (pd.Series, optional): Risk scores of the rows.
+            min_size (int): Smallest cluster to include.
+
+        Returns:
+            pd.DataFrame: Representative row, Size and, when available,
+                Companies, Job Title and Risk Score per cluster.
+        """
+        counts = np.bincount(self.inverse)
+        keep = np.flatnonzero(counts >= min_size)
+        keep = keep[np.argsort(-counts[keep], kind="stable")]
+        stats = pd.DataFrame({"Representative": self.representatives[keep], "Size": counts[keep]})
+        if df is not None and "Companies" in df.columns:
+            companies = pd.DataFrame({"cluster": self.inverse, "company": df["Companies"].to_numpy()})
+            per_cluster = companies.groupby("cluster")["company"].nunique()
+            stats["Companies"] = per_cluster.reindex(keep).to_numpy()
+        if df is not None and "Job Title" in df.columns:
+            stats["Job Title"] = df["Job Title"].iloc[stats["Representative"]].to_numpy()
+        if scores is not None:
+            stats["Risk Score"] = scores.iloc[stats["Representative"]].to_numpy()
+        return stats
@@ -0,0 +1,190 @@
+import hashlib
+import io
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from instrumentation import METRICS
+
+DEFAULT_PDF_CACHE_DIR = os.environ.get(
+    "PDF_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "pdf_text"),
+)
+
+JOB_TITLE_PATTERN = re.compile(r"(?:Job Title:|Position:)\s*(.*)", re.IGNORECASE)
+COMPANY_PATTERN = re.compile(r"(?:Company:|Hiring at:|Organization:)\s*(.*)", re.IGNORECASE)
+# A new posting starts where a line begins with a job title label
+POSTING_START = re.compile(r"^[ \t]*(?:Job Title:|Position:)", re.IGNORECASE | re.MULTILINE)
+
+
+def iter_pdf_files(files):
+    """
+    Expands uploads into individual PDFs, unpacking ZIP archives.
+
+    Args:
+        files (iterable): (name, bytes) pairs for .pdf and .zip files.
+
+    Yields:
+        tuple: (name, bytes) for every PDF, with archive members named
+            "archive.zip/member.pdf".
+    """
+    for name, data in files:
+        if name.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for member in archive.infolist():
+                    if not member.is_dir() and member.filename.lower().endswith(".pdf"):
+                        yield f"{name}/{member.filename}", archive.read(member)
+        elif name.lower().endswith(".pdf"):
+            yield name, data
+
+
+def extract_pdf_text(data):
+    """
+    Extracts the text of every page of a PDF.
+
+    Args:
+        data (bytes): PDF file contents.
+
+    Returns:
+        str: Page texts joined by newlines.
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(text for text in (page.extract_text() for page in reader.pages) if text)
+
+
+def _extract_task(data):
+    """Worker entry point: returns (text, error) instead of raising across processes."""
+    try:
+        return extract_pdf_text(data), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def split_postings(text):
+    """
+    Splits extracted text into one record per job posting.
+
+    A posting starts at each line beginning with "Job Title:" or "Position:".
+    Text with fewer than two such lines is treated as a single posting.
+
+    Args:
+        text (str): Extracted PDF text.
+
+    Returns:
+        list: Dicts with "Job Title", "Companies" and "Description".
+    """
+    starts = [match.start() for match in POSTING_START.finditer(text)]
+    if len(starts) < 2:
+        segments = [text]
+    else:
+        segments = [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+        # Keep any preamble (letterhead, cover note) with the first posting
+        segments[0] = text[:starts[1]]
+
+    records = []
+    for segment in segments:
+        job_title_match = JOB_TITLE_PATTERN.search(segment)
+        company_match = COMPANY_PATTERN.search(segment)
+        records.append({
+            "Job Title": job_title_match.group(1).strip() if job_title_match else "N/A",
+            "Companies": company_match.group(1).strip() if company_match else "N/A",
+            "Description": segment,
+        })
+    return records
+
+
+class PdfTextCache:
+    """
+    Extracted PDF text stored on disk, one file per SHA-256 of the PDF bytes.
+
+    Args:
+        directory (str): Cache directory; created on first write.
+    """
+
+    def __init__(self, directory=DEFAULT_PDF_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.txt")
+
+    def get(self, digest):
+        """Returns cached text for a PDF hash, or None."""
+        try:
+            with open(self._path(digest), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, digest, text):
+        """Stores extracted text for a PDF hash."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(digest) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, self._path(digest))
+
+
+def load_pdfs(files, workers=None, cache=None, progress=None):
+    """
+    Extracts postings from many PDFs, in parallel worker processes.
+
+    Args:
+        files (iterable): (name, bytes) pairs for .pdf and .zip files.
+        workers (int, optional): Worker processes; defaults to the CPU count.
+            With one PDF to extract, extraction runs in-process.
+        cache (PdfTextCache, optional): Cache of text by file hash.
+        progress (callable, optional): Called as progress(done, total) as PDFs finish.
+
+    Returns:
+        tuple: (df, errors) where `df` has "Job Title", "Companies",
+            "Description" and "Source File" columns (one row per posting) and
+            `errors` maps file names to extraction errors.
+    """
+    started = time.perf_counter()
+    pdfs = list(iter_pdf_files(files))
+    digests = [hashlib.sha256(data).hexdigest() for _, data in pdfs]
+    texts = [cache.get(digest) if cache is not None else None for digest in digests]
+    todo = [i for i, text in enumerate(texts) if text is None]
+    errors = {}
+
+    done = len(pdfs) - len(todo)
+    if progress is not None:
+        progress(done, len(pdfs))
+    if len(todo) > 1 and (workers is None or workers > 1):
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_extract_task, (pdfs[i][1] for i in todo))
+            for i, (text, error) in zip(todo, results):
+                texts[i], errors[pdfs[i][0]] = text, error
+                done += 1
+                if progress is not None:
+                    progress(done, len(pdfs))
+    else:
+        for i in todo:
+            texts[i], errors[pdfs[i][0]] = _extract_task(pdfs[i][1])
+            done += 1
+            if progress is not None:
+                progress(done, len(pdfs))
+    errors = {name: error for name, error in errors.items() if error is not None}
+    extracted = set(todo)
+    METRICS.record("pdf_extract", time.perf_counter() - started, len(todo))
+    METRICS.incr("pdf_files", len(pdfs))
+    METRICS.incr("pdf_cache_hits", len(pdfs) - len(todo))
+    METRICS.incr("pdf_errors", len(errors))
+
+    records = []
+    for i, ((name, _), text) in enumerate(zip(pdfs, texts)):
+        if text is None:
+            continue
+        if cache is not None and i in extracted:
+            cache.set(digests[i], text)
+        for record in split_postings(text):
+            record["Source File"] = name
+            records.append(record)
+    return pd.DataFrame(records, columns=["Job Title", "Companies", "Description", "Source File"]), errors
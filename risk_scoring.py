@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS
+from rule_engine import fold_text, get_ruleset
+
+
+def check_scam_risk(text):
+    """
+    Scores a single listing for the dashboard.
+
+    Args:
+        text (str): The job description to score.
+
+    Returns:
+        int: Risk score between 0 and 100.
+    """
+    return get_ruleset().score(str(text))["score"]
+
+
+def score_batch(series, ruleset=None, profile=False):
+    """
+    Scores a whole column of listings at once.
+
+    Produces the same scores as calling `check_scam_risk` on every row. Each
+    text is folded and checked for the ruleset's keywords once, and a rule's
+    patterns only run on the rows its keywords let through.
+
+    Args:
+        series (pd.Series): Job descriptions.
+        ruleset (RuleSet, optional): Rules to apply; defaults to the current file.
+        profile (bool): Record per-rule timing in METRICS (adds a clock read per rule).
+
+    Returns:
+        tuple: (scores, flags) where `scores` is an int Series aligned with the
+            input and `flags` is a boolean DataFrame with one column per red flag.
+    """
+    if ruleset is None:
+        ruleset = get_ruleset()
+    with METRICS.stage("score_batch", rows=len(series)):
+        return _score_batch(series, ruleset, METRICS.record_rule if profile else None)
+
+
+def _score_batch(series, ruleset, timer):
+    raw = series.astype(str).fillna("").to_numpy(dtype=object)
+    # One pass over the column: fold each text once and note which keywords it contains
+    folded = [fold_text(text) for text in raw]
+    present = [{keyword for keyword in ruleset.keywords if keyword in text} for text in folded]
+
+    flags = {flag: np.zeros(len(series), dtype=bool) for flag in ruleset.flags}
+    scores = np.zeros(len(series), dtype=np.int64)
+    for label, rule in zip(ruleset.labels, ruleset.rules):
+        candidates = ~flags[rule.flag]
+        if rule.keywords:
+            candidates &= np.fromiter((not found.isdisjoint(rule.keywords) for found in present),
+                                      dtype=bool, count=len(present))
+        rows = np.flatnonzero(candidates)
+        started = time.perf_counter()
+        hits = np.fromiter((rule.search(raw[row], folded[row], present[row]) for row in rows), dtype=bool, count=len(rows))
+        fired = rows[hits]
+        if timer is not None:
+            timer(label, time.perf_counter() - started, len(rows), len(fired))
+        flags[rule.flag][fired] = True
+        scores[fired] += rule.weight
+
+    if ruleset.max_score is not None:
+        scores = np.minimum(scores, ruleset.max_score)
+    return (
+        pd.Series(scores, index=series.index, name="Risk Score"),
+        pd.DataFrame(flags, index=series.index),
+    )
@@ -0,0 +1,502 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import re._parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+DEFAULT_RULES_PATH = os.environ.get(
+    "SCAM_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "scam_rules.json")
+)
+# How often get_ruleset() checks the rules file for changes, in seconds
+RELOAD_INTERVAL = 2.0
+
+# Gaps such as ".*?" between two sub-patterns are the source of catastrophic
+# backtracking on long PDF text, so rules express them as ordered steps instead.
+# Every other quantifier in a step must be bounded, which caps how far a single
+# match attempt can backtrack.
+MAX_STEP_REPEAT = 50
+
+_REPEATS = {_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT}
+if hasattr(_sre_parse, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(_sre_parse.POSSESSIVE_REPEAT)
+
+# Characters that re.IGNORECASE treats as an ASCII letter but str.casefold() does
+# not fold to one ("ı" stays as-is, "İ" becomes "i" plus a combining dot).
+# Mapping them keeps the keyword gate free of false negatives.
+_CASEFOLD_FIXUPS = str.maketrans({"ı": "i", "İ": "i"})
+
+
+def fold_text(text):
+    """
+    Normalizes text for the literal keyword gate.
+
+    Args:
+        text (str): Raw description text.
+
+    Returns:
+        str: Case-folded text suitable for `in` checks against rule keywords.
+    """
+    # str.isascii() is O(1); skipping translate() for ASCII text makes folding several times faster
+    if text.isascii():
+        return text.casefold()
+    return text.translate(_CASEFOLD_FIXUPS).casefold()
+
+
+def _children(op, av):
+    """Yields the sub-patterns nested in one parsed regex item."""
+    if op is _sre_parse.SUBPATTERN:
+        yield av[-1]
+    elif op is _sre_parse.BRANCH:
+        yield from av[1]
+    elif op in (_sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+        yield av[1]
+    elif op is _sre_parse.GROUPREF_EXISTS:
+        yield from (branch for branch in av[1:] if branch is not None)
+    elif op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+        yield av
+
+
+def _is_wildcard(items):
+    """True for a repeated item that matches almost any character, like ".", "[^x]" or "[\\s\\S]"."""
+    for op, av in items:
+        if op in (_sre_parse.ANY, _sre_parse.NOT_LITERAL):
+            return True
+        if op is _sre_parse.IN:
+            categories = {str(item_av) for item_op, item_av in av if item_op is _sre_parse.CATEGORY}
+            if av[0][0] is _sre_parse.NEGATE or any(
+                    category.replace("_NOT_", "_") in categories for category in categories if "_NOT_" in category):
+                return True
+        if any(_is_wildcard(child) for child in _children(op, av)):
+            return True
+    return False
+
+
+def _is_single_char(items):
+    """True for a branch that is exactly one literal character or character set."""
+    return (len(items) == 1 and items[0][0] in (_sre_parse.LITERAL, _sre_parse.IN)
+            and not (items[0][0] is _sre_parse.IN and items[0][1][0][0] is _sre_parse.NEGATE))
+
+
+def _has_branch(items):
+    """True if a parsed sub-pattern contains an alternation of anything but single characters."""
+    for op, av in items:
+        if op is _sre_parse.BRANCH and not all(_is_single_char(branch) for branch in av[1]):
+            return True
+        if any(_has_branch(child) for child in _children(op, av)):
+            return True
+    return False
+
+
+def _check_repeats(items, flag, step, in_repeat=False):
+    for op, av in items:
+        if op in _REPEATS:
+            low, high, body = av
+            if high == _sre_parse.MAXREPEAT and _is_wildcard(body):
+                raise ValueError(
+                    f"Rule '{flag}' uses an unbounded gap in {step!r}; "
+                    "split it into ordered steps instead."
+                )
+            if high == _sre_parse.MAXREPEAT or high > MAX_STEP_REPEAT:
+                raise ValueError(
+                    f"Rule '{flag}' has an unbounded quantifier in {step!r}; "
+                    f"use an explicit bound of at most {MAX_STEP_REPEAT}, e.g. {{1,{MAX_STEP_REPEAT}}}."
+                )
+            if in_repeat and high > 1:
+                raise ValueError(f"Rule '{flag}' nests quantifiers in {step!r}.")
+            # A repeated body that can match the same text in several ways, as in
+            # "(?:a|a){1,40}" or "(?:\d|\d\d){1,50}", backtracks exponentially
+            low_width, high_width = body.getwidth()
+            if high > 1 and (low_width != high_width or _has_branch(body)):
+                raise ValueError(
+                    f"Rule '{flag}' repeats an alternation or a variable-width group in {step!r}; "
+                    "repeat a single character or character set instead."
+                )
+            _check_repeats(body, flag, step, in_repeat or high > 1)
+        else:
+            for child in _children(op, av):
+                _check_repeats(child, flag, step, in_repeat)
+
+
+_ZERO_WIDTH = {_sre_parse.AT, _sre_parse.ASSERT, _sre_parse.ASSERT_NOT}
+
+
+def _required_literals(items):
+    """
+    Finds strings of which at least one occurs in every match of a parsed pattern.
+
+    Args:
+        items: Parsed pattern, as returned by `_sre_parse.parse`.
+
+    Returns:
+        frozenset or None: Folded strings (see `fold_text`), or None when no
+            such set was found. Longer strings are preferred, as they rule out
+            more texts.
+    """
+    best = None
+    run = []
+
+    def better(candidate):
+        nonlocal best
+        if candidate and (best is None or min(map(len, candidate)) > min(map(len, best))):
+            best = candidate
+
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op in _ZERO_WIDTH:
+            continue
+        if run:
+            better(frozenset([fold_text("".join(run))]))
+            run = []
+        if op is _sre_parse.SUBPATTERN:
+            better(_required_literals(av[-1]))
+        elif op is _sre_parse.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                better(frozenset().union(*branches))
+        elif op in _REPEATS and av[0] >= 1:
+            better(_required_literals(av[2]))
+    if run:
+        better(frozenset([fold_text("".join(run))]))
+    return best
+
+
+def _split_literals(literals, keywords):
+    """Splits required literals into (rule keywords, other strings), or None if there are none."""
+    if literals is None:
+        return None
+    return tuple(sorted(literals & set(keywords))), tuple(sorted(literals - set(keywords)))
+
+
+def _may_match(literals, folded, found):
+    """False only when the text cannot match a pattern with these required literals (see `Rule.search`)."""
+    if literals is None or folded is None:
+        return True
+    known, other = literals
+    if found is None:
+        return any(literal in folded for literal in known + other)
+    return any(literal in found for literal in known) or any(literal in folded for literal in other)
+
+
+def check_step(flag, step):
+    """
+    Rejects a rule step that could backtrack heavily.
+
+    Steps may not contain unbounded quantifiers ("*", "+", "{n,}"), quantifiers
+    above MAX_STEP_REPEAT, a quantifier nested inside another one, or a
+    repeated group that has alternatives or a variable width.
+
+    Args:
+        flag (str): Rule name, for the error message.
+        step (str): Regex of one step.
+
+    Raises:
+        ValueError: If the step is not safe to run on long text.
+    """
+    _check_repeats(_sre_parse.parse(step), flag, step)
+
+
+class Rule:
+    """
+    A single scam indicator compiled for fast, backtracking-safe matching.
+
+    Each alternative is either a regex string or a tuple of regex strings. A tuple
+    means "these steps appear in order on the same line", which is what a pattern
+    like `a.*?b` expresses, but it is matched in linear time.
+
+    Every step after the first is matched from the end of the earliest match of
+    the step before it, so a step must not have a shorter match that starts later
+    and ends earlier than its leftmost match (plain words and digit runs are fine).
+
+    Args:
+        flag (str): Name reported when the rule fires.
+        weight (int): Score added when the rule fires.
+        alternatives (list): Regex strings and/or tuples of regex strings.
+        keywords (tuple): Lowercase literals; at least one of them must occur in
+            every text the rule can match. Rules are skipped when none is present.
+    """
+
+    def __init__(self, flag, weight, alternatives, keywords=()):
+        self.flag = flag
+        self.weight = weight
+        self.keywords = tuple(fold_text(keyword) for keyword in keywords)
+        self.alternatives = [alternative if isinstance(alternative, str) else list(alternative)
+                             for alternative in alternatives]
+
+        plain = []
+        self.sequences = []
+        # Per pattern, literals one of which every match contains; checked before the regex runs
+        self.sequence_literals = []
+        for alternative in alternatives:
+            steps = (alternative,) if isinstance(alternative, str) else tuple(alternative)
+            for step in steps:
+                check_step(flag, step)
+            if len(steps) == 1:
+                plain.append(steps[0])
+            else:
+                self.sequences.append(tuple(re.compile(step, re.IGNORECASE) for step in steps))
+                self.sequence_literals.append([
+                    _split_literals(_required_literals(_sre_parse.parse(step)), self.keywords) for step in steps
+                ])
+        self.plain = re.compile("|".join(plain), re.IGNORECASE) if plain else None
+        self.plain_literals = (_split_literals(_required_literals(_sre_parse.parse("|".join(plain))), self.keywords)
+                               if plain else None)
+
+    def matches(self, text, folded=None):
+        """
+        Checks whether the rule fires on the given text.
+
+        Args:
+            text (str): The description to check.
+            folded (str, optional): `fold_text(text)`, if already computed.
+
+        Returns:
+            bool: True if any alternative matches.
+        """
+        if self.keywords:
+            if folded is None:
+                folded = fold_text(text)
+            if not any(keyword in folded for keyword in self.keywords):
+                return False
+        return self.search(text, folded)
+
+    def search(self, text, folded=None, found=None):
+        """
+        Runs the compiled patterns without the keyword gate.
+
+        Args:
+            text (str): The description to check.
+            folded (str, optional): `fold_text(text)`; when given, patterns whose
+                required literals it lacks are skipped without running.
+            found (set, optional): This rule's keywords that occur in `folded`,
+                if already known, so they are not searched for again.
+
+        Returns:
+            bool: True if any alternative matches.
+        """
+        if (self.plain is not None and _may_match(self.plain_literals, folded, found)
+                and self.plain.search(text)):
+            return True
+        return any(
+            _search_sequence(steps, text)
+            for steps, literals in zip(self.sequences, self.sequence_literals)
+            if all(_may_match(step_literals, folded, found) for step_literals in literals)
+        )
+
+
+def _search_sequence(steps, text):
+    """Returns True if the steps match in order within a single line of text."""
+    lead, rest = steps[0], steps[1:]
+    length = len(text)
+    pos = 0
+    while pos <= length:
+        match = lead.search(text, pos)
+        if not match:
+            return False
+        end = match.end()
+        # "." never crosses a newline, so the remaining steps must finish on this line.
+        line_end = text.find("\n", end)
+        if line_end == -1:
+            line_end = length
+        for step in rest:
+            match = step.search(text, end, line_end)
+            if not match:
+                break
+            end = match.end()
+        else:
+            return True
+        # Later lead matches on the same line end later, so they cannot do better.
+        pos = line_end + 1
+    return False
+
+
+class RuleSet:
+    """
+    An ordered collection of compiled rules, plus how to turn them into a score.
+
+    Rules sharing a flag name are scored once: the first one that fires reports
+    the flag and any later rule with the same name is skipped. Keywords shared by
+    several rules are indexed so each one is checked once per text.
+
+    `digest` identifies the rules' content. Anything derived from scores
+    (cached analyses, stored listings) should be keyed on it, not on
+    `version`, which is only changed when someone remembers to.
+
+    Args:
+        rules (list): Rule instances, in reporting order.
+        version (str): Version of the ruleset file the rules came from.
+        max_score (int, optional): Cap applied to the summed weights.
+        advice (list, optional): (min_score, text) pairs, highest threshold first.
+    """
+
+    def __init__(self, rules, version="unversioned", max_score=None, advice=()):
+        self.rules = list(rules)
+        self.version = version
+        self.max_score = max_score
+        self.advice = sorted(advice, key=lambda item: item[0], reverse=True)
+        self.flags = list(dict.fromkeys(rule.flag for rule in self.rules))
+        self.keywords = sorted({keyword for rule in self.rules for keyword in rule.keywords})
+        # Unique per rule, for timing reports: "Flag", then "Flag (2)" for a second rule with that flag
+        self.labels = []
+        for i, rule in enumerate(self.rules):
+            n = sum(other.flag == rule.flag for other in self.rules[:i]) + 1
+            self.labels.append(rule.flag if n == 1 else f"{rule.flag} ({n})")
+        content = {
+            "version": version,
+            "max_score": max_score,
+            "advice": self.advice,
+            "rules": [[rule.flag, rule.weight, rule.alternatives, rule.keywords] for rule in self.rules],
+        }
+        self.digest = hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a ruleset from parsed ruleset-file contents.
+
+        Args:
+            data (dict): Mapping with "version", "rules" and optionally
+                "max_score" and "advice" entries.
+
+        Returns:
+            RuleSet: The compiled ruleset.
+        """
+        rules = [
+            Rule(entry["flag"], entry["weight"], entry["patterns"], entry.get("keywords", ()))
+            for entry in data["rules"]
+        ]
+        advice = [(entry["min_score"], entry["text"]) for entry in data.get("advice", [])]
+        return cls(rules, str(data.get("version", "unversioned")), data.get("max_score"), advice)
+
+    def match(self, text, timer=None):
+        """
+        Runs every rule against the text.
+
+        Args:
+            text (str): The description to check.
+            timer (callable, optional): Called as timer(label, seconds, calls,
+                fired) after each rule's patterns run, to profile the rules.
+
+        Returns:
+            list: (flag, weight) pairs for the rules that fired, in rule order.
+        """
+        folded = fold_text(text)
+        present = {keyword for keyword in self.keywords if keyword in folded}
+        fired = []
+        seen = set()
+        for label, rule in zip(self.labels, self.rules):
+            if rule.flag in seen:
+                continue
+            if rule.keywords and present.isdisjoint(rule.keywords):
+                continue
+            if timer is None:
+                hit = rule.search(text, folded, present)
+            else:
+                started = time.perf_counter()
+                hit = rule.search(text, folded, present)
+                timer(label, time.perf_counter() - started, 1, int(hit))
+            if hit:
+                fired.append((rule.flag, rule.weight))
+                seen.add(rule.flag)
+        return fired
+
+    def cap(self, score):
+        """Applies the ruleset's maximum score, if it has one."""
+        return score if self.max_score is None else min(score, self.max_score)
+
+    def advise(self, score):
+        """Returns the advice text for a score, or an empty string."""
+        for min_score, text in self.advice:
+            if score >= min_score:
+                return text
+        return ""
+
+    def score(self, text, timer=None):
+        """
+        Scores a description against the ruleset.
+
+        Args:
+            text (str): The description to check.
+            timer (callable, optional): Per-rule timing callback; see `match`.
+
+        Returns:
+            dict: The risk score, identified red flags, and advice.
+        """
+        fired = self.match(text, timer)
+        score = self.cap(sum(weight for _, weight in fired))
+        return {"score": score, "flags": [flag for flag, _ in fired], "advice": self.advise(score)}
+
+
+def load_ruleset(path=DEFAULT_RULES_PATH):
+    """
+    Loads and compiles a ruleset file.
+
+    Args:
+        path (str): Path to a JSON ruleset, or YAML if PyYAML is installed.
+
+    Returns:
+        RuleSet: The compiled ruleset.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("PyYAML is required to load YAML rulesets.") from e
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return RuleSet.from_dict(data)
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def get_ruleset(path=DEFAULT_RULES_PATH):
+    """
+    Returns the compiled ruleset for a file, reloading it when the file changes.
+
+    The file's modification time is checked at most every RELOAD_INTERVAL
+    seconds, so new rules are picked up without restarting the app. If an edited
+    file fails to load, or the file cannot be read at all, the previously
+    compiled ruleset stays in use.
+
+    Args:
+        path (str): Path to the ruleset file.
+
+    Returns:
+        RuleSet: The current compiled ruleset.
+    """
+    now = time.monotonic()
+    entry = _loaded.get(path)
+    if entry is not None and now - entry[2] < RELOAD_INTERVAL:
+        return entry[0]
+    with _lock:
+        entry = _loaded.get(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            # The file is missing or unreadable (e.g. mid-replace); keep the compiled rules
+            if entry is None:
+                raise
+            _loaded[path] = (entry[0], entry[1], now)
+            return entry[0]
+        if entry is None:
+            ruleset = load_ruleset(path)
+        elif entry[1] != mtime:
+            try:
+                ruleset = load_ruleset(path)
+            except (OSError, ValueError, KeyError, TypeError, re.error):
+                ruleset = entry[0]
+        else:
+            ruleset = entry[0]
+        _loaded[path] = (ruleset, mtime, now)
+        return ruleset
@@ -0,0 +1,250 @@
+"""
+Headless batch scorer for job listing files.
+
+Scores CSV, Excel, Parquet and PDF/ZIP files (or directories of them) with
+scam_analysis.check_scam_risk across all cores, optionally escalates uncertain
+listings to GenAI, and writes the results as Parquet or CSV.
+
+Example:
+    python score_cli.py feeds/ -o scored.parquet --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import pandas as pd
+
+from analysis_cache import RISK_BINS, RISK_LABELS
+from ingestion import NEEDED_COLUMNS, compact_frame, iter_chunks
+from instrumentation import METRICS
+from scam_analysis import check_scam_risk
+
+TABLE_EXTENSIONS = (".csv", ".xlsx", ".xls", ".parquet")
+PDF_EXTENSIONS = (".pdf", ".zip")
+# Descriptions per task sent to a worker process
+TASK_ROWS = 2_000
+
+
+def find_inputs(paths):
+    """
+    Expands files and directories into the list of supported input files.
+
+    Args:
+        paths (list): Files or directories; directories are searched recursively.
+
+    Returns:
+        list: Sorted file paths.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(
+                    os.path.join(root, name) for name in names
+                    if name.lower().endswith(TABLE_EXTENSIONS + PDF_EXTENSIONS)
+                )
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            raise FileNotFoundError(path)
+    return sorted(found)
+
+
+def iter_frames(files, column, chunksize):
+    """
+    Reads every input file chunk by chunk.
+
+    Args:
+        files (list): Paths from `find_inputs`.
+        column (str): Description column to keep alongside the title and company.
+        chunksize (int): Rows per chunk for tables.
+
+    Yields:
+        pd.DataFrame: Chunks with a "Source File" column.
+    """
+    columns = tuple(dict.fromkeys(NEEDED_COLUMNS + (column,)))
+    pdfs = [path for path in files if path.lower().endswith(PDF_EXTENSIONS)]
+    for path in files:
+        name = path.lower()
+        if name.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(path)
+            keep = [col for col in parquet.schema_arrow.names if col in columns] or None
+            for batch in parquet.iter_batches(batch_size=chunksize, columns=keep):
+                yield batch.to_pandas().assign(**{"Source File": path})
+        elif name.endswith(TABLE_EXTENSIONS):
+            for chunk, _ in iter_chunks(path, name, columns, chunksize):
+                yield compact_frame(chunk).assign(**{"Source File": path})
+    if pdfs:
+        from pdf_ingestion import PdfTextCache, load_pdfs
+
+        def read(path):
+            with open(path, "rb") as f:
+                return f.read()
+
+        df, errors = load_pdfs(((path, read(path)) for path in pdfs), cache=PdfTextCache())
+        for name, error in errors.items():
+            print(f"warning: could not read {name}: {error}", file=sys.stderr)
+        if not df.empty:
+            yield df.rename(columns={"Description": column}) if column != "Description" else df
+
+
+def _score_texts(texts):
+    """
+    Worker task: scores a list of descriptions.
+
+    Returns the elapsed time along with the columns, since METRICS in a
+    worker process is not the parent's; the caller records it.
+    """
+    started = time.perf_counter()
+    results = [check_scam_risk(text) for text in texts]
+    return (
+        [result["score"] for result in results],
+        ["; ".join(result["flags"]) for result in results],
+        [result["advice"] for result in results],
+        time.perf_counter() - started,
+    )
+
+
+def score_frame(df, column, pool):
+    """
+    Adds Risk Score, Risk Level, Risk Flags and Advice columns to a chunk.
+
+    Args:
+        df (pd.DataFrame): Listings.
+        column (str): Description column.
+        pool (multiprocessing.Pool or None): Workers; None scores in-process.
+
+    Returns:
+        pd.DataFrame: The scored chunk.
+    """
+    texts = df[column].astype(str).fillna("").tolist()
+    tasks = [texts[start:start + TASK_ROWS] for start in range(0, len(texts), TASK_ROWS)]
+    results = pool.imap(_score_texts, tasks) if pool is not None else map(_score_texts, tasks)
+    scores, flags, advice = [], [], []
+    for task_scores, task_flags, task_advice, seconds in results:
+        METRICS.record("check_scam_risk", seconds, rows=len(task_scores))
+        scores.extend(task_scores)
+        flags.extend(task_flags)
+        advice.extend(task_advice)
+    df = df.assign(**{"Risk Score": scores, "Risk Flags": flags, "Advice": advice})
+    df["Risk Level"] = pd.cut(df["Risk Score"], bins=RISK_BINS, labels=RISK_LABELS, right=False)
+    return df
+
+
+def write_results(df, output):
+    """Writes results as Parquet or CSV, depending on the output file's extension."""
+    if output.lower().endswith(".parquet"):
+        df.to_parquet(output, index=False)
+    elif output.lower().endswith(".csv"):
+        df.to_csv(output, index=False)
+    else:
+        raise ValueError("Output must end in .parquet or .csv")
+
+
+def run(args):
+    """Runs the batch job described by parsed command-line arguments and returns the summary."""
+    timings = {"load": 0.0, "score": 0.0, "genai": 0.0, "write": 0.0}
+    started = time.perf_counter()
+    files = find_inputs(args.inputs)
+    if not files:
+        raise SystemExit("No supported input files found.")
+
+    workers = args.workers or os.cpu_count() or 1
+    scored = []
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        frames = iter_frames(files, args.column, args.chunksize)
+        while True:
+            mark = time.perf_counter()
+            df = next(frames, None)
+            timings["load"] += time.perf_counter() - mark
+            if df is None:
+                break
+            if args.column not in df.columns:
+                raise SystemExit(f"Column '{args.column}' not found; available columns: {', '.join(df.columns)}")
+            mark = time.perf_counter()
+            scored.append(score_frame(df, args.column, pool))
+            timings["score"] += time.perf_counter() - mark
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    df = pd.concat(scored, ignore_index=True) if scored else pd.DataFrame()
+    summary = {"files": len(files), "rows": len(df), "workers": workers}
+
+    if args.genai and not df.empty:
+        from genai_cache import GenAICache
+        from triage import triage_analyze
+
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            raise SystemExit("--genai needs the OPENAI_API_KEY environment variable.")
+        mark = time.perf_counter()
+        results, genai_summary = triage_analyze(
+            df[args.column], api_key, scores=df["Risk Score"],
+            band=None if args.top_k else tuple(args.band), top_k=args.top_k,
+            structured=True, concurrency=args.concurrency, cache=GenAICache(),
+        )
+        df = pd.concat([df, results.drop(columns="Escalated")], axis=1)
+        timings["genai"] = time.perf_counter() - mark
+        summary["genai"] = genai_summary
+
+    mark = time.perf_counter()
+    write_results(df, args.output)
+    timings["write"] = time.perf_counter() - mark
+
+    elapsed = time.perf_counter() - started
+    summary.update({
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(len(df) / timings["score"], 1) if timings["score"] else None,
+        "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        "risk_levels": df["Risk Level"].value_counts().to_dict() if not df.empty else {},
+    })
+    return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Score job listing files for scam risk without the dashboard.")
+    parser.add_argument("inputs", nargs="+", help="CSV, Excel, Parquet, PDF or ZIP files, or directories of them")
+    parser.add_argument("-o", "--output", required=True, help="Results file (.parquet or .csv)")
+    parser.add_argument("--column", default="Description", help="Column with the job descriptions")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows read per chunk")
+    parser.add_argument("--genai", action="store_true", help="Escalate uncertain listings to GenAI (needs OPENAI_API_KEY)")
+    parser.add_argument("--band", type=int, nargs=2, default=[30, 70], metavar=("LOW", "HIGH"),
+                        help="Rule scores to escalate with --genai (default: 30 70)")
+    parser.add_argument("--top-k", type=int, default=None, help="Escalate the K highest-scoring listings instead of a band")
+    parser.add_argument("--concurrency", type=int, default=8, help="GenAI requests in flight")
+    parser.add_argument("--summary-json", help="Also write the run summary to this file")
+    parser.add_argument("--metrics", action="store_true", help="Print stage timings and counters as JSON at the end")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    summary = run(args)
+    print(
+        f"Scored {summary['rows']:,} listings from {summary['files']} files in {summary['seconds']}s "
+        f"({summary['rows_per_second']} rows/s scoring, {summary['workers']} workers)"
+    )
+    print("Stage timings (s): " + ", ".join(f"{stage} {seconds}" for stage, seconds in summary["timings"].items()))
+    if "genai" in summary:
+        genai = summary["genai"]
+        print(f"GenAI: {genai['escalated']} listings escalated, {genai['sent']} sent, "
+              f"{genai['rows_not_escalated']} not escalated, {genai['cached']} served from cache, "
+              f"{genai['calls_saved']} calls saved")
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, default=str)
+    if args.metrics:
+        print(METRICS.to_json())
+
+
+if __name__ == "__main__":
+    main()
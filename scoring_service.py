@@ -0,0 +1,378 @@
+"""
+Async HTTP service for scoring job listings as they are ingested.
+
+Concurrent requests are queued and scored together in micro-batches, so the
+event loop keeps accepting connections while a batch is being scored.
+
+Endpoints:
+    POST /score        {"description": "...", "genai": false} -> one result
+    POST /score/batch  {"listings": ["...", {"id": 7, "description": "..."}]} -> {"results": [...]}
+    GET  /health       Status, ruleset version and queue depth
+    GET  /metrics      Request counts, batch sizes, p50/p99 latencies and stage timers;
+                       ?format=prometheus returns the same figures as Prometheus text
+
+Example:
+    python scoring_service.py --port 8080
+    curl -s localhost:8080/score -d '{"description": "Pay a $50 registration fee"}'
+"""
+import argparse
+import asyncio
+import bisect
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from aiohttp import web
+
+from analysis_cache import RISK_BINS, RISK_LABELS
+from instrumentation import METRICS
+from rule_engine import DEFAULT_RULES_PATH, get_ruleset
+
+MAX_BATCH = 512
+MAX_WAIT = 0.002  # Seconds a request waits for others to share its batch
+MAX_LISTINGS_PER_REQUEST = 10_000
+MAX_REQUEST_BYTES = 32 * 1024 * 1024
+GENAI_CONCURRENCY = int(os.environ.get("GENAI_CONCURRENCY", "8"))
+
+
+def risk_level(score):
+    """Returns the dashboard's Risk Level label for a score."""
+    return RISK_LABELS[min(bisect.bisect_right(RISK_BINS, score) - 1, len(RISK_LABELS) - 1)]
+
+
+def score_texts(texts, ruleset):
+    """
+    Scores a batch of descriptions with one ruleset.
+
+    Args:
+        texts (list): Job descriptions.
+        ruleset (RuleSet): Rules to apply.
+
+    Returns:
+        list: One dict per text with "score", "flags", "advice" and "risk_level".
+    """
+    results = []
+    with METRICS.stage("score_batch", rows=len(texts)):
+        for text in texts:
+            result = ruleset.score(text)
+            result["risk_level"] = risk_level(result["score"])
+            results.append(result)
+    return results
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latencies of one endpoint for percentile reporting.
+
+    Args:
+        window (int): Number of recent samples kept.
+    """
+
+    def __init__(self, window=10_000):
+        self.count = 0
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.count += 1
+        self._samples.append(seconds)
+
+    def summary(self):
+        """Returns the request count and p50/p99/max latency in milliseconds."""
+        if not self._samples:
+            return {"count": self.count, "p50_ms": None, "p99_ms": None, "max_ms": None}
+        samples = np.fromiter(self._samples, dtype=float) * 1000
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {"count": self.count, "p50_ms": round(float(p50), 3),
+                "p99_ms": round(float(p99), 3), "max_ms": round(float(samples.max()), 3)}
+
+
+class MicroBatcher:
+    """
+    Collects descriptions from concurrent requests and scores them together.
+
+    A batch is closed when it reaches `max_batch` descriptions or when its
+    oldest request has waited `max_wait` seconds, and is then scored on a
+    worker thread with a single ruleset snapshot.
+
+    Args:
+        max_batch (int): Most descriptions scored in one batch.
+        max_wait (float): Longest a request waits for a batch to fill, in seconds.
+        rules_path (str): Ruleset file; edits are picked up between batches.
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, max_wait=MAX_WAIT, rules_path=DEFAULT_RULES_PATH):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.rules_path = rules_path
+        self.batches = 0
+        self.scored = 0
+        self.batch_latency = LatencyTracker()
+        self._queue = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, texts):
+        """
+        Queues descriptions for scoring and waits for their results.
+
+        Args:
+            texts (list): Job descriptions from one request.
+
+        Returns:
+            list: Results in input order (see `score_texts`).
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            started = time.perf_counter()
+            try:
+                ruleset = get_ruleset(self.rules_path)
+                results = await loop.run_in_executor(self._executor, score_texts, texts, ruleset)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batch_latency.record(time.perf_counter() - started)
+            self.batches += 1
+            self.scored += len(texts)
+
+            start = 0
+            for request_texts, future in pending:
+                if not future.done():
+                    future.set_result(results[start:start + len(request_texts)])
+                start += len(request_texts)
+
+
+def _description(item):
+    """Pulls the description out of a listing given as a string or an object."""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict) and isinstance(item.get("description"), str):
+        return item["description"]
+    raise ValueError("Each listing must be a string or an object with a string 'description'.")
+
+
+async def _read_json(request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="Request body must be JSON.")
+
+
+async def _genai(app, texts):
+    """Runs the GenAI analysis for a request, bounded by the service-wide concurrency."""
+    from genai_analysis import analyze_batch_async
+
+    async with app["genai_semaphore"]:
+        return await analyze_batch_async(texts, app["api_key"], concurrency=GENAI_CONCURRENCY,
+                                         cache=app["genai_cache"])
+
+
+def _check_genai(app, body):
+    wants = bool(body.get("genai")) if isinstance(body, dict) else False
+    if wants and not app["api_key"]:
+        raise web.HTTPServiceUnavailable(text="GenAI analysis needs OPENAI_API_KEY to be set.")
+    return wants
+
+
+async def handle_score(request):
+    app = request.app
+    started = time.perf_counter()
+    body = await _read_json(request)
+    try:
+        text = _description(body)
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    genai = _check_genai(app, body)
+
+    result, = await app["batcher"].submit([text])
+    if genai:
+        analysis, = await _genai(app, [text])
+        result["genai"] = analysis
+    app["latency"]["score"].record(time.perf_counter() - started)
+    return web.json_response(result)
+
+
+async def handle_batch(request):
+    app = request.app
+    started = time.perf_counter()
+    body = await _read_json(request)
+    listings = body.get("listings") if isinstance(body, dict) else body
+    if not isinstance(listings, list):
+        raise web.HTTPBadRequest(text="Expected a JSON list of listings, or an object with a 'listings' list.")
+    if len(listings) > MAX_LISTINGS_PER_REQUEST:
+        raise web.HTTPRequestEntityTooLarge(max_size=MAX_LISTINGS_PER_REQUEST, actual_size=len(listings))
+    try:
+        texts = [_description(item) for item in listings]
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    genai = _check_genai(app, body)
+
+    results = await app["batcher"].submit(texts) if texts else []
+    if genai and texts:
+        for result, analysis in zip(results, await _genai(app, texts)):
+            result["genai"] = analysis
+    for item, result in zip(listings, results):
+        if isinstance(item, dict) and "id" in item:
+            result["id"] = item["id"]
+    app["latency"]["batch"].record(time.perf_counter() - started)
+    return web.json_response({"results": results})
+
+
+async def handle_health(request):
+    app = request.app
+    ruleset = get_ruleset(app["batcher"].rules_path)
+    return web.json_response({
+        "status": "ok",
+        "ruleset_version": ruleset.version,
+        "ruleset_digest": ruleset.digest,
+        "uptime_seconds": round(time.monotonic() - app["started"], 1),
+        "queue_depth": app["batcher"].queue_depth,
+        "genai_enabled": bool(app["api_key"]),
+    })
+
+
+def _prometheus_families(app):
+    """Service figures for `Metrics.to_prometheus`: latencies per endpoint and batch sizes."""
+    batcher = app["batcher"]
+    trackers = dict(app["latency"], batch_scoring=batcher.batch_latency)
+    summaries = {name: tracker.summary() for name, tracker in trackers.items()}
+    latencies = [
+        ({"endpoint": name, "quantile": quantile}, summary[key] / 1000)
+        for name, summary in summaries.items()
+        for quantile, key in (("0.5", "p50_ms"), ("0.99", "p99_ms"), ("1", "max_ms"))
+        if summary[key] is not None
+    ]
+    return [
+        ("endpoint_latency_seconds", "gauge", "Recent latency quantiles of each endpoint.", latencies),
+        ("endpoint_requests_total", "counter", "Requests served by each endpoint.",
+         [({"endpoint": name}, summary["count"]) for name, summary in summaries.items()]),
+        ("batches_total", "counter", "Micro-batches scored.", [({}, batcher.batches)]),
+        ("listings_scored_total", "counter", "Listings scored in micro-batches.", [({}, batcher.scored)]),
+        ("mean_batch_size", "gauge", "Mean listings per micro-batch.",
+         [({}, batcher.scored / batcher.batches)] if batcher.batches else []),
+    ]
+
+
+async def handle_metrics(request):
+    app = request.app
+    if request.query.get("format") == "prometheus":
+        text = METRICS.to_prometheus(extra=_prometheus_families(app))
+        return web.Response(text=text, content_type="text/plain", charset="utf-8")
+    batcher = app["batcher"]
+    snapshot = METRICS.snapshot()
+    return web.json_response({
+        "endpoints": {name: tracker.summary() for name, tracker in app["latency"].items()},
+        "batches": batcher.batches,
+        "listings_scored": batcher.scored,
+        "mean_batch_size": round(batcher.scored / batcher.batches, 2) if batcher.batches else None,
+        "batch_scoring": batcher.batch_latency.summary(),
+        "stages": snapshot["stages"],
+        "counters": snapshot["counters"],
+    })
+
+
+def create_app(max_batch=MAX_BATCH, max_wait=MAX_WAIT, rules_path=DEFAULT_RULES_PATH, api_key=None, genai_cache=None):
+    """
+    Builds the aiohttp application.
+
+    Args:
+        max_batch (int): Most descriptions scored in one batch.
+        max_wait (float): Longest a request waits for a batch to fill, in seconds.
+        rules_path (str): Ruleset file to score with.
+        api_key (str, optional): OpenAI API key; GenAI requests are refused without one.
+        genai_cache (GenAICache, optional): Persistent cache of GenAI replies.
+
+    Returns:
+        web.Application: The service, ready for `web.run_app`.
+    """
+    get_ruleset(rules_path)  # Fail at startup, not on the first request, if the rules don't load
+    app = web.Application(client_max_size=MAX_REQUEST_BYTES)
+    app["batcher"] = MicroBatcher(max_batch, max_wait, rules_path)
+    app["latency"] = {"score": LatencyTracker(), "batch": LatencyTracker()}
+    app["api_key"] = api_key
+    app["genai_cache"] = genai_cache
+    app["started"] = time.monotonic()
+
+    async def on_startup(app):
+        app["genai_semaphore"] = asyncio.Semaphore(GENAI_CONCURRENCY)
+        await app["batcher"].start()
+
+    async def on_cleanup(app):
+        await app["batcher"].stop()
+        if app["genai_cache"] is not None:
+            app["genai_cache"].close()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.add_routes([
+        web.post("/score", handle_score),
+        web.post("/score/batch", handle_batch),
+        web.get("/health", handle_health),
+        web.get("/metrics", handle_metrics),
+    ])
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve scam risk scoring over HTTP.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Most listings scored per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT * 1000,
+                        help="Longest a request waits for its batch to fill")
+    parser.add_argument("--reuse-port", action="store_true",
+                        help="Let several service processes share the port, one per core")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("OPENAI_API_KEY")
+    genai_cache = None
+    if api_key:
+        from genai_cache import GenAICache
+
+        genai_cache = GenAICache()
+    app = create_app(args.max_batch, args.max_wait_ms / 1000, api_key=api_key, genai_cache=genai_cache)
+    web.run_app(app, host=args.host, port=args.port, reuse_port=args.reuse_port or None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Reproducible synthetic job listings for benchmarks and manual testing.
+
+The same arguments and seed always produce the same listings.
+
+Example:
+    python synthetic_corpus.py --rows 50000 --scam-density 0.3 -o listings.csv
+    python synthetic_corpus.py --rows 500 --pdfs 25 -o pdfs/
+"""
+import argparse
+import io
+import os
+import random
+import textwrap
+
+import pandas as pd
+
+TITLES = [
+    "Marketing Intern", "Software Engineering Intern", "Data Analyst", "Content Writer",
+    "Graphic Design Intern", "Sales Associate", "HR Intern", "Business Development Executive",
+    "Research Assistant", "Customer Support Representative", "Finance Intern", "Web Developer",
+]
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises",
+    "Hooli", "Vandelay Industries", "Soylent Co", "Cyberdyne Systems", "Tyrell Corp", "Wonka Foods",
+]
+LEGIT_SENTENCES = [
+    "You will work closely with our product team on real customer projects.",
+    "The role involves preparing weekly reports and presenting findings to stakeholders.",
+    "Candidates should be comfortable with spreadsheets and basic data analysis.",
+    "We offer a monthly stipend, flexible hours and mentorship from senior staff.",
+    "Interns join a structured onboarding program during their first two weeks.",
+    "Strong written and verbal communication skills are expected.",
+    "The position is based in our city office with two remote days per week.",
+    "You will help organize campus events and manage social media calendars.",
+    "Applicants will be invited to a technical interview with the hiring manager.",
+    "Familiarity with Python, SQL or Excel is an advantage but not required.",
+    "Our team values curiosity, ownership and clear documentation.",
+    "Selected candidates receive a formal offer letter before joining.",
+    "The internship lasts three months with a possibility of extension.",
+    "Please submit your resume and a short cover letter through our careers page.",
+]
+# Each phrase triggers at least one rule in scam_rules.json
+SCAM_PHRASES = [
+    "This is an unpaid internship with no stipend.",
+    "Pay a registration fee of 2500 INR to confirm your seat.",
+    "We guarantee you a job after the training program.",
+    "You will receive a certificate after payment of the course fee.",
+    "There is no offer letter; we work on verbal confirmation only.",
+    "No experience needed and no interview required, immediate joining.",
+    "Hurry, limited time offer! Only a few seats left.",
+    "Send money to secure your position today.",
+    "A deposit of $150 is required before you start.",
+    "You have been selected; pay the processing amount to continue.",
+    "Investment required to unlock premium projects.",
+]
+# Words that pass the rules' keyword checks, forcing the full patterns to run
+NEAR_MISS_WORDS = ["pay", "fee", "deposit", "job", "certificate", "selected", "transfer", "guarantee"]
+
+
+def generate_description(rng, words, scam_phrases=0):
+    """
+    Builds one description of roughly `words` words.
+
+    Args:
+        rng (random.Random): Random source.
+        words (int): Target length in words.
+        scam_phrases (int): Number of scam phrases mixed into the text.
+
+    Returns:
+        str: The description.
+    """
+    sentences = []
+    length = 0
+    while length < words:
+        sentence = rng.choice(LEGIT_SENTENCES)
+        sentences.append(sentence)
+        length += sentence.count(" ") + 1
+    for _ in range(scam_phrases):
+        sentences.insert(rng.randrange(len(sentences) + 1), rng.choice(SCAM_PHRASES))
+    return " ".join(sentences)
+
+
+def generate_long_description(rng, words):
+    """
+    Builds a pathological description: one very long line dense with rule
+    keywords, so every rule's patterns have to scan it.
+
+    Args:
+        rng (random.Random): Random source.
+        words (int): Length in words.
+
+    Returns:
+        str: The description.
+    """
+    filler = [word for sentence in LEGIT_SENTENCES for word in sentence.split()]
+    return " ".join(rng.choice(NEAR_MISS_WORDS) if rng.random() < 0.2 else rng.choice(filler) for _ in range(words))
+
+
+def generate_listings(rows, scam_density=0.2, mean_words=120, length_sigma=0.6, long_fraction=0.0,
+                      long_words=50_000, seed=0):
+    """
+    Generates a DataFrame of synthetic job listings.
+
+    Args:
+        rows (int): Number of listings.
+        scam_density (float): Fraction of listings containing scam phrases.
+        mean_words (int): Median description length in words.
+        length_sigma (float): Spread of the log-normal length distribution.
+        long_fraction (float): Fraction of listings replaced by pathological long texts.
+        long_words (int): Length of the pathological texts in words.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: "Job Title", "Companies" and "Description" columns.
+    """
+    rng = random.Random(seed)
+    titles, companies, descriptions = [], [], []
+    for _ in range(rows):
+        titles.append(rng.choice(TITLES))
+        companies.append(rng.choice(COMPANIES))
+        if rng.random() < long_fraction:
+            descriptions.append(generate_long_description(rng, long_words))
+            continue
+        words = max(5, int(rng.lognormvariate(0, length_sigma) * mean_words))
+        phrases = rng.randint(1, 3) if rng.random() < scam_density else 0
+        descriptions.append(generate_description(rng, words, phrases))
+    return pd.DataFrame({"Job Title": titles, "Companies": companies, "Description": descriptions})
+
+
+def listings_to_pdf(listings):
+    """
+    Renders listings into one PDF in the layout `pdf_ingestion.split_postings` expects.
+
+    Needs reportlab.
+
+    Args:
+        listings (pd.DataFrame): Listings from `generate_listings`.
+
+    Returns:
+        bytes: PDF file contents.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    _, height = A4
+    y = height - 50
+
+    def write(line):
+        nonlocal y
+        if y < 50:
+            pdf.showPage()
+            y = height - 50
+        pdf.drawString(50, y, line)
+        y -= 14
+
+    for listing in listings.itertuples(index=False):
+        write(f"Job Title: {listing[0]}")
+        write(f"Company: {listing[1]}")
+        for line in textwrap.wrap(listing[2], 95):
+            write(line)
+        y -= 14
+    pdf.save()
+    return buffer.getvalue()
+
+
+def generate_pdfs(listings, per_pdf=10):
+    """
+    Splits listings into PDFs of `per_pdf` postings each.
+
+    Args:
+        listings (pd.DataFrame): Listings from `generate_listings`.
+        per_pdf (int): Postings per PDF.
+
+    Returns:
+        list: (name, bytes) pairs, as accepted by `pdf_ingestion.load_pdfs`.
+    """
+    return [
+        (f"listings_{start // per_pdf:05d}.pdf", listings_to_pdf(listings.iloc[start:start + per_pdf]))
+        for start in range(0, len(listings), per_pdf)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic job listings.")
+    parser.add_argument("-o", "--output", required=True,
+                        help="A .csv, .xlsx or .parquet file, or a directory when --pdfs is given")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--scam-density", type=float, default=0.2, help="Fraction of listings with scam phrases")
+    parser.add_argument("--mean-words", type=int, default=120, help="Median description length in words")
+    parser.add_argument("--length-sigma", type=float, default=0.6, help="Spread of description lengths")
+    parser.add_argument("--long-fraction", type=float, default=0.0, help="Fraction of pathological long texts")
+    parser.add_argument("--long-words", type=int, default=50_000, help="Words per pathological text")
+    parser.add_argument("--pdfs", type=int, default=None, help="Write this many PDFs instead of a table")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = generate_listings(args.rows, args.scam_density, args.mean_words, args.length_sigma,
+                           args.long_fraction, args.long_words, args.seed)
+    if args.pdfs:
+        os.makedirs(args.output, exist_ok=True)
+        for name, data in generate_pdfs(df, per_pdf=max(1, -(-args.rows // args.pdfs))):
+            with open(os.path.join(args.output, name), "wb") as f:
+                f.write(data)
+    elif args.output.endswith(".xlsx"):
+        df.to_excel(args.output, index=False)
+    elif args.output.endswith(".parquet"):
+        df.to_parquet(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS
+
+# Same notion of a word as the `\b` boundaries used for term matching
+TOKEN_PATTERN = r"\w+"
+_SINGLE_TOKEN = re.compile(rf"^{TOKEN_PATTERN}$")
+
+
+class TermIndex:
+    """
+    Inverted index from lowercase word to the rows that contain it.
+
+    Built with one tokenizing pass over a text column, after which document
+    frequencies and matching rows for any term list are lookups. A term matches
+    a row when it appears as a whole word, like `\\bterm\\b` on lowercased text.
+    Multi-word terms are narrowed down with the index, then confirmed with a
+    regex on the candidate rows only.
+
+    Args:
+        texts (pd.Series): The indexed text column.
+        vocabulary (dict): Word -> position in `indptr`.
+        indptr (np.ndarray): Offsets into `indices`, one slice per word.
+        indices (np.ndarray): Sorted row positions for each word, concatenated.
+    """
+
+    def __init__(self, texts, vocabulary, indptr, indices):
+        self.texts = texts
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def build(cls, texts):
+        """
+        Tokenizes a text column once and builds the index.
+
+        Args:
+            texts (pd.Series): Descriptions to index.
+
+        Returns:
+            TermIndex: The index; row ids are positions in `texts`.
+        """
+        with METRICS.stage("term_index", rows=len(texts)):
+            find_tokens = re.compile(TOKEN_PATTERN).findall
+            tokens = [find_tokens(text) for text in texts.astype(str).fillna("").str.lower()]
+            lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+            rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+            codes, uniques = pd.factorize(np.array(list(chain.from_iterable(tokens)), dtype=object))
+
+            # One posting per (word, row) pair, sorted by word then row
+            n_rows = max(len(texts), 1)
+            pairs = codes.astype(np.int64) * n_rows + rows
+            pairs.sort()
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+            word_ids, row_ids = np.divmod(pairs, n_rows)
+            indptr = np.zeros(len(uniques) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(word_ids, minlength=len(uniques)), out=indptr[1:])
+            vocabulary = {word: i for i, word in enumerate(uniques)}
+        return cls(texts, vocabulary, indptr, row_ids.astype(np.int32))
+
+    def rows(self, term):
+        """
+        Returns the positions of the rows containing a term.
+
+        Args:
+            term (str): A word or phrase; case-insensitive.
+
+        Returns:
+            np.ndarray: Sorted row positions.
+        """
+        term = term.strip().lower()
+        if _SINGLE_TOKEN.match(term):
+            word_id = self.vocabulary.get(term)
+            if word_id is None:
+                return np.empty(0, dtype=np.int32)
+            return self.indices[self.indptr[word_id]:self.indptr[word_id + 1]]
+
+        words = re.findall(TOKEN_PATTERN, term)
+        if not words:
+            return np.empty(0, dtype=np.int32)
+        candidates = self.rows(words[0])
+        for word in words[1:]:
+            candidates = np.intersect1d(candidates, self.rows(word), assume_unique=True)
+        pattern = re.compile(rf"(?<!\w){re.escape(term)}(?!\w)")
+        texts = self.texts.iloc[candidates].astype(str)
+        return candidates[np.array([bool(pattern.search(text.lower())) for text in texts], dtype=bool)]
+
+    def doc_freq(self, term):
+        """Returns the number of rows containing a term."""
+        return len(self.rows(term))
+
+    def counts(self, terms):
+        """
+        Counts the rows containing each term.
+
+        Args:
+            terms (list): Words or phrases.
+
+        Returns:
+            pd.DataFrame: A "Count" column indexed by term, highest first.
+        """
+        counts = {term: self.doc_freq(term) for term in terms}
+        return pd.DataFrame.from_dict(counts, orient="index", columns=["Count"]).sort_values("Count", ascending=False)
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from analysis_cache import AnalysisCache, analyze_dataset
+from instrumentation import METRICS
+from risk_scoring import score_batch
+from rule_engine import get_ruleset
+
+BASE = ("Join our marketing team as a junior associate. You will help plan campaigns, "
+        "write weekly reports and support the sales staff across three regional offices.")
+
+REPOSTS = pd.DataFrame({
+    "Companies": ["Acme", "Acme", "Acme"],
+    "Description": [
+        BASE,
+        BASE + " Pay 5000 deposit to confirm.",
+        BASE + " This is an unpaid position.",
+    ],
+})
+
+
+def test_near_duplicates_keep_their_own_scores():
+    ruleset = get_ruleset()
+    analysis = analyze_dataset(REPOSTS, "Description", ruleset, dedupe=True)
+    expected, _ = score_batch(REPOSTS["Description"], ruleset)
+
+    assert analysis.clusters.n_clusters == 1
+    assert analysis.scores.tolist() == expected.tolist()
+    assert analysis.scores.iloc[0] == 0
+    assert analysis.scores.iloc[1] > 0
+    assert analysis.scores.iloc[2] > 0
+
+
+def test_grouping_toggle_reuses_the_analysis():
+    ruleset = get_ruleset()
+    cache = AnalysisCache()
+    before = METRICS.snapshot()["stages"].get("score_batch", {}).get("calls", 0)
+
+    plain = cache.get(REPOSTS, "reposts", "Description", ruleset)
+    grouped = cache.get(REPOSTS, "reposts", "Description", ruleset, dedupe=True)
+    again = cache.get(REPOSTS, "reposts", "Description", ruleset, dedupe=True)
+
+    assert METRICS.snapshot()["stages"]["score_batch"]["calls"] - before == 1
+    assert cache.misses == 1
+    assert plain.clusters is None
+    assert grouped is again
+    assert grouped.scores is plain.scores
+    assert "Clusters" in grouped.company_stats.columns
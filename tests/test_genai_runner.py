@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from genai_analysis import analyze_batch_async
+
+
+async def serve(statuses, retry_after=None):
+    """
+    Starts a local stand-in for the chat completions endpoint.
+
+    Replies with each status in `statuses` in turn (then 200), and counts the
+    requests it received.
+    """
+    calls = []
+
+    async def completions(request):
+        body = await request.json()
+        calls.append(body)
+        status = statuses[len(calls) - 1] if len(calls) <= len(statuses) else 200
+        if status != 200:
+            headers = {"Retry-After": retry_after} if retry_after is not None else {}
+            return web.json_response({"error": {"message": "slow down", "type": "rate_limit"}},
+                                     status=status, headers=headers)
+        return web.json_response({
+            "id": "mock", "object": "chat.completion", "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": " Looks legitimate. "},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1", calls
+
+
+def run(statuses, retry_after=None, **kwargs):
+    async def main():
+        runner, api_base, calls = await serve(statuses, retry_after)
+        try:
+            started = time.perf_counter()
+            results = await analyze_batch_async(["Pay a fee to join"], "test-key", api_base=api_base, **kwargs)
+            return results, calls, time.perf_counter() - started
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_429_is_retried_after_retry_after():
+    results, calls, elapsed = run([429, 429], retry_after="0.2", max_retries=3, base_delay=30)
+    assert results[0]["error"] is None
+    assert results[0]["analysis"] == "Looks legitimate."
+    assert results[0]["attempts"] == 3
+    assert len(calls) == 3
+    # The server's delay is used instead of the (much longer) backoff
+    assert 0.4 <= elapsed < 5
+
+
+def test_retry_after_is_capped_by_max_delay():
+    results, calls, elapsed = run([429], retry_after="3600", max_retries=2, base_delay=30, max_delay=0.1)
+    assert results[0]["error"] is None
+    assert len(calls) == 2
+    assert elapsed < 5
+
+
+def test_gives_up_after_retry_budget():
+    results, calls, _ = run([429] * 10, retry_after="0", max_retries=2, base_delay=30)
+    assert results[0]["analysis"] is None
+    assert "RateLimitError" in results[0]["error"]
+    assert results[0]["attempts"] == 3
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    results, calls, _ = run([400], max_retries=5)
+    assert results[0]["error"] is not None
+    assert len(calls) == 1
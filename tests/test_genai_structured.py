@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from genai_analysis import _analyze_structured_batch, parse_structured_response
+
+
+def reply(*entries):
+    return json.dumps(list(entries))
+
+
+def entry(item_id, verdict="scam", score=90, indicators=("fee",)):
+    return {"id": item_id, "verdict": verdict, "score": score, "indicators": list(indicators)}
+
+
+def test_parses_every_id():
+    records = parse_structured_response(reply(entry(0), entry(1, "legitimate", 5.4, [])), [0, 1])
+    assert records == {
+        0: {"verdict": "scam", "score": 90, "indicators": ["fee"]},
+        1: {"verdict": "legitimate", "score": 5, "indicators": []},
+    }
+
+
+def test_accepts_code_fence_and_string_ids():
+    content = "```json\n" + reply(entry("0", "Suspicious"), entry(" 1 ")) + "\n```"
+    records = parse_structured_response(content, [0, 1])
+    assert set(records) == {0, 1}
+    assert records[0]["verdict"] == "suspicious"
+
+
+@pytest.mark.parametrize("content", [
+    "not json",
+    '[{"id": 0, "verdict": "scam"',
+    '{"id": 0, "verdict": "scam", "score": 1}',
+    "",
+])
+def test_malformed_json_is_rejected(content):
+    with pytest.raises(ValueError):
+        parse_structured_response(content, [0])
+
+
+@pytest.mark.parametrize("entries", [
+    [entry(0)],                              # missing id
+    [entry(0), entry(0), entry(1)],          # duplicate id
+    [entry(0), entry(1), entry(2)],          # extra id
+    [entry(0), "scam"],                      # entry is not an object
+    [entry(0), {"verdict": "scam", "score": 1}],
+])
+def test_ids_must_match_exactly_once(entries):
+    with pytest.raises(ValueError):
+        parse_structured_response(json.dumps(entries), [0, 1])
+
+
+@pytest.mark.parametrize("bad", [
+    entry([0]), entry({"id": 0}), entry(None), entry(True), entry(0.0),
+    entry(0, verdict="maybe"), entry(0, verdict=None),
+    entry(0, score="90"), entry(0, score=101), entry(0, score=-1), entry(0, score=True), entry(0, score=None),
+    dict(entry(0), indicators="fee"),
+])
+def test_wrong_types_are_rejected(bad):
+    with pytest.raises(ValueError):
+        parse_structured_response(json.dumps([bad]), [0])
+
+
+class FakeRunner:
+    """Returns canned replies in order instead of calling the API."""
+
+    def __init__(self, contents):
+        self.contents = list(contents)
+
+    async def complete(self, messages, temperature=None, max_tokens=None):
+        return {"content": self.contents.pop(0), "error": None, "attempts": 1}
+
+
+def test_bad_batch_reply_falls_back_to_single_requests():
+    runner = FakeRunner([reply(entry([0]), entry(1)), reply(entry(0)), reply(entry(1, "legitimate", 3))])
+    records = asyncio.run(_analyze_structured_batch(runner, [(0, "a"), (1, "b")]))
+    assert records[0]["verdict"] == "scam" and records[0]["error"] is None
+    assert records[1]["verdict"] == "legitimate" and records[1]["attempts"] == 2
+    assert runner.contents == []
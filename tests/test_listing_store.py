@@ -0,0 +1,57 @@
+import copy
+import json
+
+import pandas as pd
+
+from analysis_cache import AnalysisCache
+from listing_store import ListingStore
+from rule_engine import DEFAULT_RULES_PATH, RuleSet
+
+
+def rulesets():
+    with open(DEFAULT_RULES_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    edited = copy.deepcopy(data)
+    edited["rules"][0]["weight"] = 45  # "Unpaid Opportunity", same version string
+    return RuleSet.from_dict(data), RuleSet.from_dict(edited)
+
+
+LISTINGS = pd.DataFrame({
+    "Job Title": ["Intern", "Intern", "Analyst"],
+    "Companies": ["A", "B", "C"],
+    "Description": ["An unpaid internship", "Pay to work with us", "A normal paid role"],
+})
+
+
+def test_edited_rules_rescore_stored_listings():
+    original, edited = rulesets()
+    store = ListingStore(":memory:")
+    _, summary = store.merge(LISTINGS, "Description", original)
+    assert summary["new"] == 3
+    _, summary = store.merge(LISTINGS, "Description", original)
+    assert summary["reused"] == 3
+    results, summary = store.merge(LISTINGS, "Description", edited)
+    assert summary["rescored"] == 3
+    assert results["Risk Score"].iloc[0] == 45
+
+
+def test_edited_rules_miss_the_analysis_cache():
+    original, edited = rulesets()
+    cache = AnalysisCache()
+    before = cache.get(LISTINGS, "fingerprint", "Description", original)
+    after = cache.get(LISTINGS, "fingerprint", "Description", edited)
+    assert cache.misses == 2
+    assert before.scores.iloc[0] == 20 and after.scores.iloc[0] == 45
+
+
+def test_keys_far_apart_are_looked_up():
+    # These two keys differ by more than the int64 range
+    listings = pd.DataFrame({
+        "Job Title": ["Intern", "Intern"],
+        "Companies": ["A", "A"],
+        "Description": ["Listing 0", "Listing 19"],
+    })
+    store = ListingStore(":memory:")
+    store.merge(listings, "Description")
+    _, summary = store.merge(listings, "Description")
+    assert summary["reused"] == 2
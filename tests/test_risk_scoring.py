@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from risk_scoring import check_scam_risk, score_batch
+
+# The dashboard's phrase list before it moved to scam_rules.json, with its old weights
+OLD_PHRASES = {
+    "no payment": 15, "unpaid": 15, "deposit required": 25, "send money": 25,
+    "guaranteed job": 20, "immediate start": 10, "no experience needed": 10,
+    "registration fee": 20, "training fee": 20, "investment required": 25,
+    "pay to work": 30, "application fee": 20,
+}
+OLD_AMOUNTS = ["$500", "5000 INR", "200 USD", "100 dollars", "3000 rupees", "750₹"]
+
+
+@pytest.mark.parametrize("phrase", list(OLD_PHRASES) + OLD_AMOUNTS)
+def test_old_dashboard_phrases_still_score(phrase):
+    text = f"Great internship opportunity. {phrase.capitalize()} for all candidates."
+    assert check_scam_risk(text) > 0
+
+
+def test_score_batch_matches_check_scam_risk():
+    texts = pd.Series([f"Join us, {phrase} applies." for phrase in list(OLD_PHRASES) + OLD_AMOUNTS]
+                      + ["A normal, paid marketing internship.", None])
+    scores, flags = score_batch(texts)
+    assert scores.tolist() == [check_scam_risk(text) for text in texts.astype(str)]
+    assert flags.index.equals(texts.index)
+
+
+@pytest.mark.parametrize("text", ["İmmediate joining", "UNPAİD internship", "unpaıd internship"])
+def test_dotted_and_dotless_i_are_folded(text):
+    assert check_scam_risk(text) > 0
+    assert score_batch(pd.Series([text]))[0].tolist() == [check_scam_risk(text)]
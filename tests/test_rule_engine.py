@@ -0,0 +1,157 @@
+import copy
+import json
+import random
+import re
+import time
+
+import pytest
+
+import rule_engine
+import synthetic_corpus
+from rule_engine import (DEFAULT_RULES_PATH, MAX_STEP_REPEAT, Rule, RuleSet, check_step, fold_text, get_ruleset,
+                         load_ruleset)
+
+# The regexes check_scam_risk used before the rule engine, kept as the reference
+OLD_PATTERNS = {
+    "Unpaid Opportunity": r"\bunpaid\b|\bno (?:stipend|payment|compensation)\b|\bwithout pay\b",
+    "Advance Fee Scam": r"(?:pay|deposit|transfer|fee).*?(?:application|registration|process|confirm|fee|amount|INR|₹|\d+)\b",
+    "Guaranteed Job Scam": r"\bguarantee.*?\bjob\b|\bjob.*?\bguarantee\b",
+    "Certificate Scam": r"\bonly certificate\b|\bcertificate after payment\b|\bpay.*?certificate\b",
+    "No Proper Documentation": r"\bno offer letter\b|\bverbal confirmation\b|\bafter payment.*?letter\b",
+    "Too Good to Be True": r"\bno experience needed\b|\bno interview required\b|\bimmediate joining\b|\bwork from top MNC\b",
+    "High Pressure Tactics": r"\blimited time\b|\bimmediate\b|\bhurry\b|\bselected\b.*?\bpay\b",
+    "Suspicious Payment Amounts": r"\b\d{4,}\b.*?(?:fee|deposit|pay)",
+}
+OLD_PAYMENT_AMOUNTS = r"(?:pay|deposit|fee).*?(\d{4,})"
+# Rules the shared ruleset extended with the dashboard's phrases; they may fire more often than before
+EXTENDED_FLAGS = {"Advance Fee Scam", "Suspicious Payment Amounts"}
+
+EDGE_CASES = [
+    "",
+    "pay\nregistration",
+    "pay the registration",
+    "Pay 5000 now",
+    "fee: 12345678901234567890123456789012345",
+    "the job\nis guaranteed",
+    "guaranteed job",
+    "You have been SELECTED! Please pay",
+    "selected\npay",
+    "certificate after payment",
+    "pay for your certificate",
+    "after payment we send the offer letter",
+    "after payment\nletter",
+    "I, candidate, was selected. Pay later.",
+    "transfer amount 25 to confirm",
+    "deposIt 1234",
+    "DEPOSİT 1234 fee",
+    "1234 is the code, pay later",
+    "12345abc fee",
+    "jobguarantee",
+    "no stipend and no payment",
+    "work from top mnc",
+]
+
+VOCABULARY = [
+    "pay", "payment", "deposit", "transfer", "fee", "fees", "application", "registration", "process",
+    "confirm", "amount", "INR", "₹", "1234", "50", "99999", "job", "jobs", "guarantee", "guaranteed",
+    "certificate", "only", "after", "letter", "no", "offer", "verbal", "confirmation", "selected",
+    "immediate", "joining", "hurry", "limited", "time", "unpaid", "stipend", "the", "a", "\n", ",", ".",
+]
+
+
+def corpus():
+    rng = random.Random(7)
+    texts = list(EDGE_CASES)
+    texts += synthetic_corpus.generate_listings(300, scam_density=0.6, seed=3)["Description"].tolist()
+    texts += [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 30))) for _ in range(3000)]
+    return texts
+
+
+def old_flags(text):
+    flags = {flag for flag, pattern in OLD_PATTERNS.items() if re.search(pattern, text, re.IGNORECASE)}
+    if re.findall(OLD_PAYMENT_AMOUNTS, text, re.IGNORECASE):
+        flags.add("Advance Fee Scam")
+    return flags
+
+
+def test_rules_match_old_regexes():
+    ruleset = load_ruleset()
+    for text in corpus():
+        old = old_flags(text)
+        new = {flag for flag, _ in ruleset.match(text)}
+        assert old <= new, text
+        assert {flag for flag in new - old if flag not in EXTENDED_FLAGS} == set(), text
+
+
+@pytest.mark.parametrize("step", [
+    r".*", r".+?", r"[\s\S]*", r"[^\n]+", r".{0,}", r"(?:.)*", r"(a+)+", r"\d+\s*(?:USD|INR)",
+    r"(?:ab{1,3}){1,4}", r"x{0,%d}" % (MAX_STEP_REPEAT + 1), r"(?=a*)b",
+    r"(?:\d|\d\d){1,50}x", r"(?:a|a){1,40}b", r"(?:.|a){1,40}b", r"(?:ab?){1,10}",
+])
+def test_backtracking_prone_steps_are_rejected(step):
+    with pytest.raises(ValueError):
+        check_step("Test", step)
+    with pytest.raises(ValueError):
+        Rule("Test", 10, [step])
+
+
+@pytest.mark.parametrize("step", [
+    r"\bpay\b", r"\b\d{4,30}\b", r"\d\s{0,10}(?:USD|INR)", r"(?:a|bc)?d{1,3}", r"(?:\d|[xy]){1,4}", r"(?:ab){1,3}",
+])
+def test_bounded_steps_are_accepted(step):
+    check_step("Test", step)
+
+
+def test_literal_prefilter_never_changes_a_match():
+    ruleset = load_ruleset()
+    for text in corpus():
+        folded = fold_text(text)
+        for rule in ruleset.rules:
+            found = {keyword for keyword in rule.keywords if keyword in folded}
+            assert rule.search(text, folded, found) == rule.search(text), (rule.flag, text)
+            assert rule.search(text, folded) == rule.search(text), (rule.flag, text)
+
+
+@pytest.mark.parametrize("pattern, text", [
+    (r"\bno (?:stipend|payment)\b", "NO STIPEND"),
+    (r"(?:ab|)c", "xc"),
+    (r"x?yz", "YZ"),
+    (r"(?:fee){1,3}s", "FEEFEES"),
+    (r"\$\d|\d\s{0,10}(?:USD|₹)", "5 usd"),
+    (r"stra(?=ss)sse", "STRASSE"),
+    (r"straße", "STRASSE"),
+])
+def test_literal_prefilter_keeps_matches(pattern, text):
+    rule = Rule("Test", 10, [pattern, ("pay", pattern)])
+    assert rule.search(text, fold_text(text)) == rule.search(text)
+    assert rule.search("pay " + text, fold_text("pay " + text)) == rule.search("pay " + text)
+
+
+def test_long_text_scores_quickly():
+    text = "pay " + "1" * 200_000 + " " + "x " * 100_000
+    started = time.perf_counter()
+    load_ruleset().score(text)
+    assert time.perf_counter() - started < 2
+
+
+def test_digest_tracks_rule_content_not_version():
+    with open(DEFAULT_RULES_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    digest = RuleSet.from_dict(data).digest
+    assert RuleSet.from_dict(copy.deepcopy(data)).digest == digest
+    edited = copy.deepcopy(data)
+    edited["rules"][0]["weight"] += 1
+    assert RuleSet.from_dict(edited).version == RuleSet.from_dict(data).version
+    assert RuleSet.from_dict(edited).digest != digest
+
+
+def test_missing_rules_file_keeps_the_cached_ruleset(tmp_path, monkeypatch):
+    monkeypatch.setattr(rule_engine, "RELOAD_INTERVAL", 0)
+    path = tmp_path / "rules.json"
+    with open(DEFAULT_RULES_PATH, encoding="utf-8") as f:
+        path.write_text(f.read(), encoding="utf-8")
+    ruleset = get_ruleset(str(path))
+    path.unlink()
+    assert get_ruleset(str(path)) is ruleset
+    with pytest.raises(FileNotFoundError):
+        get_ruleset(str(tmp_path / "never-loaded.json"))
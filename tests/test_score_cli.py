@@ -0,0 +1,16 @@
+from multiprocessing import Pool
+
+import pandas as pd
+
+from instrumentation import METRICS
+from score_cli import score_frame
+
+
+def test_worker_timings_reach_the_parent_metrics():
+    df = pd.DataFrame({"Description": ["Pay a $50 registration fee", "A normal paid role"] * 5})
+    before = METRICS.snapshot()["stages"].get("check_scam_risk", {}).get("rows", 0)
+    with Pool(2) as pool:
+        scored = score_frame(df, "Description", pool)
+
+    assert scored["Risk Score"].iloc[0] > 0
+    assert METRICS.snapshot()["stages"]["check_scam_risk"]["rows"] - before == len(df)
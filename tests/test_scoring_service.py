@@ -0,0 +1,35 @@
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from scoring_service import create_app
+
+
+def run(requests):
+    async def main():
+        client = TestClient(TestServer(create_app()))
+        await client.start_server()
+        try:
+            for path, body in requests:
+                response = await client.post(path, json=body)
+                assert response.status == 200
+            response = await client.get("/metrics", params={"format": "prometheus"})
+            return await response.text()
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+def test_prometheus_output_covers_the_service_figures():
+    text = run([
+        ("/score", {"description": "Pay a $50 registration fee"}),
+        ("/score/batch", {"listings": ["An unpaid internship", "A normal paid role"]}),
+    ])
+    assert 'scamternship_stage_calls_total{stage="score_batch"}' in text
+    assert 'scamternship_endpoint_latency_seconds{endpoint="score",quantile="0.5"}' in text
+    assert 'scamternship_endpoint_latency_seconds{endpoint="batch",quantile="0.99"}' in text
+    assert 'scamternship_endpoint_requests_total{endpoint="batch"} 1' in text
+    assert "scamternship_listings_scored_total 3" in text
+    assert "scamternship_batches_total" in text
+    assert "scamternship_mean_batch_size" in text
@@ -0,0 +1,46 @@
+import pandas as pd
+
+import triage
+from triage import triage_analyze
+
+
+def fake_analyze(sent):
+    def analyze(texts, api_key, **kwargs):
+        sent.extend(texts)
+        return [{"analysis": f"checked {text}", "error": None} for text in texts]
+    return analyze
+
+
+def test_rows_with_stored_results_are_not_sent_again(monkeypatch):
+    sent = []
+    monkeypatch.setattr(triage, "analyze_batch", fake_analyze(sent))
+    texts = pd.Series(["a", "b", "c", "d"], index=[10, 11, 12, 13])
+    scores = pd.Series([90, 80, 70, 0], index=texts.index)
+    stored = pd.Series([True, False, False, False], index=texts.index)
+
+    results, summary = triage_analyze(texts, "key", scores=scores, band=(50, 100), exclude=stored)
+
+    assert sent == ["b", "c"]
+    assert results["Escalated"].tolist() == [False, True, True, False]
+    assert results["GenAI Analysis"].isna().tolist() == [True, False, False, True]
+    assert summary["escalated"] == 2
+    assert summary["already_analyzed"] == 1
+
+
+def test_calls_saved_counts_requests_actually_made(monkeypatch):
+    sent = []
+
+    def analyze(texts, api_key, **kwargs):
+        sent.extend(texts)
+        return [{"analysis": text, "error": None, "cached": text == "cached"} for text in texts]
+
+    monkeypatch.setattr(triage, "analyze_batch", analyze)
+    texts = pd.Series(["cached", "same", "same", "new", "low"])
+    scores = pd.Series([90, 90, 90, 90, 0])
+
+    _, summary = triage_analyze(texts, "key", scores=scores, band=(50, 100))
+
+    assert sent == ["cached", "same", "same", "new"]
+    assert summary["cached"] == 1
+    assert summary["requests"] == 2
+    assert summary["calls_saved"] == 3
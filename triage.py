@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from genai_analysis import analyze_batch, analyze_structured
+from risk_scoring import score_batch
+
+# Rule scores in this range are ambiguous enough to be worth an LLM opinion
+DEFAULT_BAND = (30, 70)
+
+
+def select_for_genai(scores, band=DEFAULT_BAND, top_k=None):
+    """
+    Picks which rows to escalate from rule scoring to GenAI analysis.
+
+    Args:
+        scores (pd.Series): Rule-based risk scores.
+        band (tuple, optional): (low, high) scores; rows with low <= score < high
+            are escalated. None disables the band.
+        top_k (int, optional): Also escalate the K highest-scoring rows.
+
+    Returns:
+        pd.Series: Boolean mask aligned with `scores`. Everything is escalated
+            when neither a band nor top_k is given.
+    """
+    values = scores.to_numpy()
+    if band is None and not top_k:
+        return pd.Series(True, index=scores.index)
+    mask = np.zeros(len(values), dtype=bool)
+    if band is not None:
+        low, high = band
+        mask |= (values >= low) & (values < high)
+    if top_k:
+        mask[np.argsort(-values, kind="stable")[:top_k]] = True
+    return pd.Series(mask, index=scores.index)
+
+
+def triage_analyze(texts, api_key, scores=None, band=DEFAULT_BAND, top_k=None, structured=False, clusters=None,
+                   exclude=None, **batch_kwargs):
+    """
+    Scores every row with the local rules and sends only the escalated rows to GenAI.
+
+    Args:
+        texts (pd.Series): Job descriptions.
+        api_key (str): OpenAI API key.
+        scores (pd.Series, optional): Precomputed rule scores; computed if omitted.
+        band (tuple, optional): Uncertainty band passed to `select_for_genai`.
+        top_k (int, optional): Number of top-scoring rows to escalate as well.
+        structured (bool): Use batched JSON verdicts (`analyze_structured`)
+            instead of one free-text analysis per row (`analyze_batch`).
+        clusters (NearDuplicateClusters, optional): Near-duplicate groups of
+            `texts`; only one escalated listing per group is sent, and its
+            result is copied to the group's other escalated listings.
+        exclude (pd.Series, optional): Boolean mask of rows that already have
+            GenAI results (e.g. from the listing store); they are never escalated.
+        **batch_kwargs: Passed to the GenAI function (concurrency, rate limits,
+            cache, batch_size, ...).
+
+    Returns:
+        tuple: (results, summary) where `results` is a DataFrame aligned with
+            `texts` with an "Escalated" column, "GenAI Error", and either
+            "GenAI Analysis" or "GenAI Verdict", "GenAI Score" and
+            "GenAI Indicators" (rows that were not escalated are empty), and
+            `summary` is a dict with rows, escalated, sent, rows_not_escalated,
+            already_analyzed (selected but excluded), cached, requests and
+            calls_saved counts. "sent" counts listings sent after grouping;
+            "requests" counts the distinct texts actually analyzed once cache
+            hits and identical texts are taken out, and calls_saved is rows
+            minus requests. In structured mode several of those texts share
+            one API request.
+    """
+    if scores is None:
+        scores, _ = score_batch(texts)
+    escalate = select_for_genai(scores, band, top_k).to_numpy(dtype=bool)
+    already_analyzed = 0
+    if exclude is not None:
+        exclude = np.asarray(exclude, dtype=bool)
+        already_analyzed = int((escalate & exclude).sum())
+        escalate = escalate & ~exclude
+    rows = np.flatnonzero(escalate)
+    # Send the first escalated row of each near-duplicate group on behalf of the rest
+    if clusters is not None and len(rows):
+        _, first, inverse = np.unique(clusters.labels[rows], return_index=True, return_inverse=True)
+        sent = rows[first]
+    else:
+        sent, inverse = rows, np.arange(len(rows))
+
+    if structured:
+        fields = {"GenAI Verdict": "verdict", "GenAI Score": "score", "GenAI Indicators": "indicators"}
+    else:
+        fields = {"GenAI Analysis": "analysis"}
+    fields["GenAI Error"] = "error"
+    columns = {column: np.full(len(texts), None, dtype=object) for column in fields}
+    cached = requests = 0
+    if len(rows):
+        analyze = analyze_structured if structured else analyze_batch
+        batch = analyze(texts.iloc[sent].tolist(), api_key, **batch_kwargs)
+        for column, field in fields.items():
+            values = [result[field] for result in batch]
+            if field == "indicators":
+                values = ["; ".join(value) if value else None for value in values]
+            columns[column][rows] = np.array(values, dtype=object)[inverse]
+        cached = sum(result.get("cached", False) for result in batch)
+        requests = len({text for text, result in zip(texts.iloc[sent], batch) if not result.get("cached", False)})
+
+    results = pd.DataFrame(dict(columns, Escalated=escalate), index=texts.index)
+    if structured:
+        results["GenAI Score"] = pd.to_numeric(results["GenAI Score"])
+
+    summary = {
+        "rows": len(texts),
+        "escalated": len(rows),
+        "sent": len(sent),
+        "rows_not_escalated": len(texts) - len(rows),
+        "already_analyzed": already_analyzed,
+        "cached": cached,
+        "requests": requests,
+        "calls_saved": len(texts) - requests,
+    }
+    return results, summary
@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+
+from instrumentation import METRICS
+
+FULL_SIZE = (1000, 600)
+PREVIEW_SIZE = (400, 240)
+MAX_WORDS = 100
+PREVIEW_MAX_WORDS = 50
+
+
+def default_stopwords():
+    """Returns the stopword set that WordCloud uses by default."""
+    from wordcloud import STOPWORDS
+
+    return set(STOPWORDS)
+
+
+def _keep(word, stopwords):
+    """Drops stopwords, single characters and bare numbers, as WordCloud does."""
+    return len(word) > 1 and not word.isdigit() and word not in stopwords
+
+
+def frequencies_from_index(term_index, stopwords=None, limit=1000):
+    """
+    Reads word frequencies straight from a TermIndex.
+
+    The weights are document frequencies (listings containing the word), so
+    one very long PDF cannot dominate the cloud.
+
+    Args:
+        term_index (TermIndex): Index of the description column.
+        stopwords (set, optional): Words to skip; defaults to WordCloud's list.
+        limit (int): Keep only the most frequent words.
+
+    Returns:
+        dict: Word -> number of listings containing it.
+    """
+    if stopwords is None:
+        stopwords = default_stopwords()
+    doc_freq = np.diff(term_index.indptr)
+    words = list(term_index.vocabulary)
+    frequencies = {}
+    for i in np.argsort(-doc_freq, kind="stable"):
+        if _keep(words[i], stopwords):
+            frequencies[words[i]] = int(doc_freq[i])
+            if len(frequencies) >= limit:
+                break
+    return frequencies
+
+
+def render_wordcloud_png(frequencies, preview=False):
+    """
+    Renders a word cloud image from precomputed frequencies.
+
+    Args:
+        frequencies (dict): Word -> weight.
+        preview (bool): Render a small, faster image with fewer words.
+
+    Returns:
+        bytes: PNG image data.
+    """
+    from wordcloud import WordCloud
+
+    width, height = PREVIEW_SIZE if preview else FULL_SIZE
+    with METRICS.stage("wordcloud_preview" if preview else "wordcloud"):
+        wordcloud = WordCloud(
+            width=width, height=height, background_color="white", colormap="Reds",
+            max_words=PREVIEW_MAX_WORDS if preview else MAX_WORDS,
+            contour_width=1, contour_color='steelblue'
+        ).generate_from_frequencies(frequencies)
+        buffer = io.BytesIO()
+        wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()